@@ -0,0 +1,45 @@
+"""Helpers for ETag-based conditional GET responses."""
+
+import hashlib
+from typing import Any, Optional
+
+import orjson
+from fastapi import Response, status
+
+
+def make_etag(*parts) -> str:
+    """Weak ETag over the repr of `parts` (filters, timestamps, counts)."""
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against `etag`."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def _cache_headers(etag: str) -> dict:
+    # no-cache：允许客户端缓存，但每次都要带 If-None-Match 回来校验
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_cache_headers(etag))
+
+
+def dump_json(payload: Any) -> bytes:
+    """Encode plain dicts/lists with orjson, matching pydantic's datetime format."""
+    # OPT_UTC_Z：UTC 时间输出为 ...Z，与 model_dump_json 一致
+    return orjson.dumps(payload, option=orjson.OPT_UTC_Z)
+
+
+def json_response(body: bytes, etag: str) -> Response:
+    return Response(content=body, media_type="application/json", headers=_cache_headers(etag))
@@ -0,0 +1,29 @@
+"""Runtime metrics routes."""
+
+from fastapi import APIRouter
+
+from app.db import session
+from app.db.pool import pool_stats
+from app.schemas.metrics import PoolConfig, PoolMetricsResponse, TagCacheStats
+from app.services import tag_cache
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("/pool", response_model=PoolMetricsResponse)
+def get_pool_metrics():
+    """Pool occupancy and checkout wait times for this worker process."""
+    async_pool = None
+    if session.async_engine is not None:
+        async_pool = pool_stats(session.async_engine.pool)
+    return PoolMetricsResponse(
+        config=PoolConfig(**session.pool_options),
+        sync_pool=pool_stats(session.engine.pool),
+        async_pool=async_pool,
+    )
+
+
+@router.get("/tag-cache", response_model=TagCacheStats)
+def get_tag_cache_metrics():
+    """Hit rate and current version of this worker's tag cache."""
+    return TagCacheStats(**tag_cache.cache.stats())
@@ -2,7 +2,7 @@
 
 from fastapi import APIRouter
 
-from app.api import tags, tickets
+from app.api import metrics, stats, tags, tickets
 
 router = APIRouter()
 
@@ -15,4 +15,6 @@ def health_check():
 
 router.include_router(tags.router)
 router.include_router(tickets.router)
+router.include_router(stats.router)
+router.include_router(metrics.router)
 
@@ -0,0 +1,15 @@
+"""Ticket statistics routes."""
+
+from fastapi import APIRouter, Depends
+
+from app.db.session import DbRunner, get_runner
+from app.schemas.stats import TicketStatsResponse
+from app.services import stats_service
+
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+
+@router.get("", response_model=TicketStatsResponse)
+async def get_ticket_stats(runner: DbRunner = Depends(get_runner)):
+    """Ticket counts per status and per tag, served from trigger-maintained counters."""
+    return await runner.run(stats_service.get_ticket_stats)
@@ -1,68 +1,234 @@
 """Ticket API routes."""
 
-from typing import List, Optional
+import asyncio
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+
+from app.api import http_cache
+from app.db.session import DbRunner, get_runner
+from app.schemas.ticket import (
+    TicketBulkCreate,
+    TicketBulkDelete,
+    TicketBulkItemResult,
+    TicketBulkResponse,
+    TicketBulkUpdate,
+    TicketCreate,
+    TicketListResponse,
+    TicketOut,
+    TicketUpdate,
+)
+from app.services import response_cache, tag_service, ticket_events, ticket_export, ticket_service
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+router = APIRouter(prefix="/tickets", tags=["tickets"])
 
-from app.db.session import get_db
-from app.schemas.ticket import TicketCreate, TicketListResponse, TicketOut, TicketUpdate
-from app.services import ticket_service
 
-router = APIRouter(prefix="/tickets", tags=["tickets"])
+def _parse_tag_ids(tag_ids: Optional[str]) -> Optional[List[int]]:
+    if not tag_ids:
+        return None
+    return [int(t) for t in tag_ids.split(",") if t.strip().isdigit()]
 
 
 @router.get("", response_model=TicketListResponse)
-def list_tickets(
+async def list_tickets(
     tag_ids: Optional[str] = Query(None, description="逗号分隔的标签 ID，如 1,2"),
     search: Optional[str] = None,
+    search_mode: Literal["title", "fulltext"] = Query(
+        "title", description="title：标题模糊匹配；fulltext：标题+描述全文检索并按相关度排序"
+    ),
     status_param: Optional[str] = Query(None, alias="status"),
     limit: int = 50,
     offset: int = 0,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="上一页返回的 next_cursor，传入后忽略 offset"),
+    include_total: bool = Query(True, description="为 false 时不计算 total（无限滚动场景）"),
+    if_none_match: Optional[str] = Header(None),
+    runner: DbRunner = Depends(get_runner),
 ):
-    parsed_tag_ids: Optional[List[int]] = None
-    if tag_ids:
-        parsed_tag_ids = [int(t) for t in tag_ids.split(",") if t.strip().isdigit()]
+    parsed_tag_ids = _parse_tag_ids(tag_ids)
+    filters = dict(
+        tag_ids=sorted(set(parsed_tag_ids)) if parsed_tag_ids else None,
+        search=search,
+        status=status_param,
+        search_mode=search_mode,
+    )
+    page = dict(limit=limit, offset=offset, cursor=cursor, include_total=include_total)
+    # 标签名来自标签缓存，且删除标签会级联删除关联而不更新 ticket：版本一并计入缓存键与 ETag
+    tags_version = await runner.run(tag_service.tags_version)
+    cache_key = repr((sorted({**filters, **page}.items()), tags_version))
+    # 同一种请求始终用同一种 ETag：带 total 的 offset 页按整个结果集的 max(updated_at)+总数，
+    # cursor 页与 include_total=false 按本页行（校验时重跑本页查询，不做全集聚合）
+    aggregate_etag = include_total and not cursor
+
+    cached = response_cache.ticket_lists.get(cache_key)
+    if cached:
+        etag, body = cached
+        if http_cache.etag_matches(if_none_match, etag):
+            return http_cache.not_modified(etag)
+        return http_cache.json_response(body, etag)
+
+    # 聚合 ETag 的轮询先做一次聚合校验，未变化则不查列表、不序列化
+    fingerprint = None
+    if if_none_match and aggregate_etag:
+        fingerprint = await runner.run(ticket_service.ticket_list_fingerprint, **filters)
+        etag = http_cache.make_etag(cache_key, *fingerprint)
+        if http_cache.etag_matches(if_none_match, etag):
+            return http_cache.not_modified(etag)
+
+    try:
+        result = await runner.run(ticket_service.list_tickets, **filters, **page, lean=True)
+    except ticket_service.InvalidCursorError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    if aggregate_etag:
+        if fingerprint is None and (result.last_modified is not None or result.total == 0):
+            # 窗口函数已顺带算出整个结果集的 max(updated_at) 与总数
+            fingerprint = (result.last_modified, result.total)
+        elif fingerprint is None:
+            # offset 越界时窗口函数没有行，补一次聚合
+            fingerprint = await runner.run(ticket_service.ticket_list_fingerprint, **filters)
+        etag = http_cache.make_etag(cache_key, *fingerprint)
+    else:
+        etag = http_cache.make_etag(
+            cache_key,
+            [(item["id"], item["updated_at"]) for item in result.items],
+            result.total,
+            result.next_cursor,
+        )
+        if http_cache.etag_matches(if_none_match, etag):
+            return http_cache.not_modified(etag)
+
+    # lean 路径：普通行直接用 orjson 编码，跳过 ORM 与 TicketOut 校验
+    body = http_cache.dump_json(
+        {"items": result.items, "total": result.total, "next_cursor": result.next_cursor}
+    )
+    response_cache.ticket_lists.set(cache_key, (etag, body))
+    return http_cache.json_response(body, etag)
+
 
-    items, total = ticket_service.list_tickets(
-        db,
-        tag_ids=parsed_tag_ids,
+@router.get("/export", response_class=StreamingResponse)
+async def export_tickets(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    tag_ids: Optional[str] = Query(None, description="逗号分隔的标签 ID，如 1,2"),
+    search: Optional[str] = None,
+    search_mode: Literal["title", "fulltext"] = "title",
+    status_param: Optional[str] = Query(None, alias="status"),
+):
+    """Stream every matching ticket with its tags as NDJSON or CSV."""
+    body = ticket_export.stream_tickets(
+        format,
+        tag_ids=_parse_tag_ids(tag_ids),
         search=search,
         status=status_param,
-        limit=limit,
-        offset=offset,
+        search_mode=search_mode,
+    )
+    return StreamingResponse(
+        body,
+        media_type=ticket_export.EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="tickets.{format}"'},
+    )
+
+
+# SSE 心跳间隔（秒），防止代理因空闲断开连接
+_SSE_KEEPALIVE = 15
+
+
+@router.get("/events", response_class=StreamingResponse)
+async def ticket_event_stream(request: Request):
+    """Server-Sent Events feed of ticket create/update/delete events.
+
+    Each event carries only the ticket id; clients fetch the ticket (cheaply,
+    with If-None-Match) or drop it on delete. A `ticket.resync` event, or a
+    reconnect, means events may have been missed and the list should be
+    reloaded.
+    """
+
+    async def stream():
+        queue = ticket_events.broker.subscribe()
+        try:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=_SSE_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield event.to_sse()
+        finally:
+            ticket_events.broker.unsubscribe(queue)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
-    return TicketListResponse(items=items, total=total)
+
+
+def _bulk_response(results: List[TicketBulkItemResult]) -> TicketBulkResponse:
+    succeeded = sum(1 for r in results if r.status in ("created", "updated", "deleted"))
+    return TicketBulkResponse(items=results, succeeded=succeeded, failed=len(results) - succeeded)
+
+
+# 批量路由需注册在 /{ticket_id} 之前，避免 "bulk" 被当作 ticket_id 解析
+@router.post("/bulk", response_model=TicketBulkResponse)
+async def bulk_create_tickets(payload: TicketBulkCreate, runner: DbRunner = Depends(get_runner)):
+    results = await runner.run(ticket_service.bulk_create_tickets, payload.items)
+    return _bulk_response(results)
+
+
+@router.patch("/bulk", response_model=TicketBulkResponse)
+async def bulk_update_tickets(payload: TicketBulkUpdate, runner: DbRunner = Depends(get_runner)):
+    results = await runner.run(ticket_service.bulk_update_tickets, payload.items)
+    return _bulk_response(results)
+
+
+@router.post("/bulk/delete", response_model=TicketBulkResponse)
+async def bulk_delete_tickets(payload: TicketBulkDelete, runner: DbRunner = Depends(get_runner)):
+    results = await runner.run(ticket_service.bulk_delete_tickets, payload.ids)
+    return _bulk_response(results)
 
 
 @router.get("/{ticket_id}", response_model=TicketOut)
-def get_ticket(ticket_id: int, db: Session = Depends(get_db)):
-    ticket = ticket_service.get_ticket(db, ticket_id)
+async def get_ticket(
+    ticket_id: int,
+    if_none_match: Optional[str] = Header(None),
+    runner: DbRunner = Depends(get_runner),
+):
+    tags_version = await runner.run(tag_service.tags_version)
+    if if_none_match:
+        last_modified = await runner.run(ticket_service.ticket_last_modified, ticket_id)
+        etag = http_cache.make_etag(ticket_id, last_modified, tags_version)
+        if last_modified and http_cache.etag_matches(if_none_match, etag):
+            return http_cache.not_modified(etag)
+
+    ticket = await runner.run(ticket_service.get_ticket, ticket_id)
     if not ticket:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ticket not found")
-    return ticket
+    etag = http_cache.make_etag(ticket_id, ticket.updated_at, tags_version)
+    return http_cache.json_response(TicketOut.model_validate(ticket).model_dump_json().encode(), etag)
 
 
 @router.post("", response_model=TicketOut, status_code=status.HTTP_201_CREATED)
-def create_ticket(ticket_in: TicketCreate, db: Session = Depends(get_db)):
-    ticket = ticket_service.create_ticket(db, ticket_in)
+async def create_ticket(ticket_in: TicketCreate, runner: DbRunner = Depends(get_runner)):
+    ticket = await runner.run(ticket_service.create_ticket, ticket_in)
     return ticket
 
 
 @router.patch("/{ticket_id}", response_model=TicketOut)
-def update_ticket(ticket_id: int, ticket_in: TicketUpdate, db: Session = Depends(get_db)):
-    ticket = ticket_service.update_ticket(db, ticket_id, ticket_in)
+async def update_ticket(
+    ticket_id: int,
+    ticket_in: TicketUpdate,
+    runner: DbRunner = Depends(get_runner),
+):
+    ticket = await runner.run(ticket_service.update_ticket, ticket_id, ticket_in)
     if not ticket:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ticket not found")
     return ticket
 
 
 @router.delete("/{ticket_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_ticket(ticket_id: int, db: Session = Depends(get_db)):
-    ok = ticket_service.delete_ticket(db, ticket_id)
+async def delete_ticket(ticket_id: int, runner: DbRunner = Depends(get_runner)):
+    ok = await runner.run(ticket_service.delete_ticket, ticket_id)
     if not ok:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ticket not found")
     return None
-
-
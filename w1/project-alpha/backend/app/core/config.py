@@ -14,6 +14,32 @@ class Settings(BaseModel):
         "postgresql://postgres:@localhost:5432/projectalpha",
     )
     api_prefix: str = "/api"
+    # 连接池：每个 uvicorn worker 各自持有一个池，总连接数约为 workers * (size + overflow)
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    db_pool_timeout: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    db_pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    db_pool_pre_ping: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+    # DB_ASYNC=true 时路由通过 asyncpg + AsyncSession 访问数据库，否则走同步引擎 + 线程池
+    db_async: bool = os.getenv("DB_ASYNC", "false").lower() in ("1", "true", "yes")
+    async_database_url: str = os.getenv("ASYNC_DATABASE_URL", "")
+    # 标签缓存：配置 Redis 后多个 worker 共享失效版本号，否则只在本进程内失效
+    tag_cache_redis_url: str = os.getenv("TAG_CACHE_REDIS_URL", "")
+    tag_cache_check_interval: float = float(os.getenv("TAG_CACHE_CHECK_INTERVAL", "1.0"))
+    # 标签快照最长存活秒数：不配 Redis 时其他 worker 的写入最多这么久后可见，0 表示不过期
+    tag_cache_ttl: float = float(os.getenv("TAG_CACHE_TTL", "60"))
+    # Ticket 列表响应缓存的 TTL（秒），0 表示关闭；跨 worker 的最长陈旧时间即为该值
+    ticket_response_cache_ttl: float = float(os.getenv("TICKET_RESPONSE_CACHE_TTL", "0"))
+    ticket_response_cache_max_entries: int = int(os.getenv("TICKET_RESPONSE_CACHE_MAX_ENTRIES", "256"))
+    # Ticket 变更推送：memory 仅在本进程内广播（单 worker）；postgres 通过 LISTEN/NOTIFY 跨 worker
+    ticket_events_backend: str = os.getenv("TICKET_EVENTS_BACKEND", "postgres")
+
+    def get_async_database_url(self) -> str:
+        """Async driver URL, derived from `database_url` unless set explicitly."""
+        if self.async_database_url:
+            return self.async_database_url
+        scheme, _, rest = self.database_url.partition("://")
+        return f"{scheme.split('+')[0]}+asyncpg://{rest}"
 
 
 @lru_cache
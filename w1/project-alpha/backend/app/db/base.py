@@ -10,6 +10,6 @@ class Base(DeclarativeBase):
 
 
 # Import models so that Base.metadata is aware of them for create_all
-from app.models import ticket, tag, ticket_tag  # noqa: E402,F401
+from app.models import ticket, tag, ticket_tag, ticket_stats  # noqa: E402,F401
 
 
@@ -0,0 +1,83 @@
+"""Triggers that keep ticket_status_counts and tag_ticket_counts up to date.
+
+Statement-level triggers with transition tables aggregate each INSERT,
+UPDATE or DELETE into one upsert per affected status/tag, so bulk writes
+and FK cascades are counted the same way as single-row writes. Counts
+change in the writing transaction and are exact once it commits. The
+trigger DDL lives in migrations/0004_ticket_counters.sql, which
+`install_counter_triggers` applies as-is.
+
+`rebuild_counters` recomputes both tables from scratch; run it through
+`python -m app.db.reconcile_counters` if the counters are ever suspected
+to have drifted (e.g. rows written while the triggers were disabled).
+"""
+
+from pathlib import Path
+
+from sqlalchemy import func, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.models import Ticket, ticket_tags
+from app.models.ticket_stats import TagTicketCount, TicketStatusCount
+
+# 触发器与函数只在迁移文件里维护一份，init_db 直接执行该文件
+COUNTERS_MIGRATION = Path(__file__).resolve().parents[2] / "migrations" / "0004_ticket_counters.sql"
+
+
+def install_counter_triggers(engine: Engine) -> None:
+    """Apply the counters migration: tables, trigger functions, triggers and a backfill.
+
+    The file carries its own BEGIN/COMMIT, so it runs on an autocommit
+    connection. It is idempotent and safe to re-run.
+    """
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.exec_driver_sql(COUNTERS_MIGRATION.read_text())
+
+
+def rebuild_counters(conn: Connection) -> dict[str, dict]:
+    """Recompute both counter tables; returns the entries that had drifted.
+
+    Writers to tickets and ticket_tags are blocked (SHARE lock) until the
+    surrounding transaction commits, so no trigger update can interleave.
+    """
+    conn.execute(text("LOCK TABLE tickets, ticket_tags IN SHARE MODE"))
+    status_table = TicketStatusCount.__table__
+    tag_table = TagTicketCount.__table__
+
+    actual_status = dict(
+        conn.execute(select(Ticket.status, func.count()).group_by(Ticket.status)).all()
+    )
+    actual_tags = dict(
+        conn.execute(
+            select(ticket_tags.c.tag_id, func.count()).group_by(ticket_tags.c.tag_id)
+        ).all()
+    )
+    stored_status = dict(conn.execute(select(status_table.c.status, status_table.c.count)).all())
+    stored_tags = dict(conn.execute(select(tag_table.c.tag_id, tag_table.c.count)).all())
+
+    conn.execute(status_table.delete())
+    conn.execute(tag_table.delete())
+    if actual_status:
+        conn.execute(
+            status_table.insert(),
+            [{"status": status, "count": count} for status, count in actual_status.items()],
+        )
+    if actual_tags:
+        conn.execute(
+            tag_table.insert(),
+            [{"tag_id": tag_id, "count": count} for tag_id, count in actual_tags.items()],
+        )
+    return {
+        "status": _drift(stored_status, actual_status),
+        "tags": _drift(stored_tags, actual_tags),
+    }
+
+
+def _drift(stored: dict, actual: dict) -> dict:
+    # 计数为 0 的行与缺失的行视为一致
+    keys = set(stored) | set(actual)
+    return {
+        key: {"stored": stored.get(key, 0), "actual": actual.get(key, 0)}
+        for key in sorted(keys, key=str)
+        if stored.get(key, 0) != actual.get(key, 0)
+    }
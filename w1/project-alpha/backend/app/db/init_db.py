@@ -5,11 +5,13 @@ Run `python -m app.db.init_db` from the backend directory to create tables.
 
 from app.db.session import engine
 from app.db.base import Base  # noqa: F401  - imports models for metadata side effects
+from app.db.counters import install_counter_triggers
 
 
 def init_db() -> None:
-    """Create all database tables based on ORM models."""
+    """Create all database tables, counter triggers and initial counts."""
     Base.metadata.create_all(bind=engine)
+    install_counter_triggers(engine)
 
 
 if __name__ == "__main__":
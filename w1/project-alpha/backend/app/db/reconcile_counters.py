@@ -0,0 +1,22 @@
+"""Rebuild the ticket counter tables from the source rows.
+
+Run `python -m app.db.reconcile_counters` from the backend directory, e.g.
+from a nightly cron job. Prints any entries that had drifted.
+"""
+
+from app.db.counters import rebuild_counters
+from app.db.session import engine
+
+
+def reconcile() -> dict[str, dict]:
+    with engine.begin() as conn:
+        return rebuild_counters(conn)
+
+
+if __name__ == "__main__":
+    drift = reconcile()
+    for kind, entries in drift.items():
+        for key, counts in entries.items():
+            print(f"{kind} {key}: stored={counts['stored']} actual={counts['actual']}")
+    if not any(drift.values()):
+        print("Counters are consistent.")
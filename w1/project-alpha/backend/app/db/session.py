@@ -1,19 +1,64 @@
 """Database session and engine configuration."""
 
+from typing import Any, Callable, TypeVar
+
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
 
 from app.core.config import get_settings
+from app.db.pool import TimedAsyncQueuePool, TimedQueuePool
 
 settings = get_settings()
 
+pool_options = dict(
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+    pool_pre_ping=settings.db_pool_pre_ping,
+)
+
 engine = create_engine(
     settings.database_url,
-    pool_pre_ping=True,
+    poolclass=TimedQueuePool,
+    **pool_options,
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 仅在 DB_ASYNC 开启时创建，避免同步部署也依赖 asyncpg
+async_engine = None
+AsyncSessionLocal = None
+if settings.db_async:
+    async_engine = create_async_engine(
+        settings.get_async_database_url(),
+        poolclass=TimedAsyncQueuePool,
+        **pool_options,
+    )
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False)
+
+T = TypeVar("T")
+
+
+class DbRunner:
+    """Runs `Session`-based service functions from async route handlers.
+
+    With the async engine the function executes inside
+    `AsyncSession.run_sync`, so waiting on Postgres yields to the event loop
+    instead of holding a threadpool worker. With the sync engine it runs in
+    the threadpool, which matches plain `def` routes.
+    """
+
+    def __init__(self, session: Session | AsyncSession):
+        self.session = session
+
+    async def run(self, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+        if isinstance(self.session, AsyncSession):
+            return await self.session.run_sync(fn, *args, **kwargs)
+        return await run_in_threadpool(fn, self.session, *args, **kwargs)
+
 
 def get_db():
     """FastAPI dependency that yields a database session."""
@@ -23,3 +68,16 @@ def get_db():
     finally:
         db.close()
 
+
+async def get_runner():
+    """FastAPI dependency that yields a `DbRunner` for the configured engine."""
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as session:
+            yield DbRunner(session)
+        return
+
+    db = SessionLocal()
+    try:
+        yield DbRunner(db)
+    finally:
+        await run_in_threadpool(db.close)
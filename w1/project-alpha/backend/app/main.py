@@ -1,14 +1,32 @@
 """FastAPI entrypoint."""
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.routes import router as api_router
 from app.core.config import get_settings
+from app.db.session import engine
+from app.services import response_cache, ticket_events
 
 settings = get_settings()
 
-app = FastAPI(title=settings.app_name)
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    # 其他 worker 的写入也要让本进程的列表响应缓存失效
+    ticket_events.broker.add_listener(lambda _events: response_cache.invalidate_tickets())
+    listener = None
+    if settings.ticket_events_backend == "postgres":
+        listener = ticket_events.PgListener(engine)
+        listener.start()
+    yield
+    if listener:
+        listener.stop()
+
+
+app = FastAPI(title=settings.app_name, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -3,5 +3,6 @@
 from .ticket import Ticket  # noqa: F401
 from .tag import Tag  # noqa: F401
 from .ticket_tag import ticket_tags  # noqa: F401
+from .ticket_stats import TagTicketCount, TicketStatusCount  # noqa: F401
 
 
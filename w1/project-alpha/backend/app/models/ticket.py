@@ -2,7 +2,8 @@
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, Integer, String, Text
+from sqlalchemy import Computed, DateTime, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -12,6 +13,11 @@ class Ticket(Base):
     """Represents a ticket/task item."""
 
     __tablename__ = "tickets"
+    __table_args__ = (
+        # 支撑 ORDER BY created_at DESC, id DESC 的 keyset 分页
+        Index("ix_tickets_created_at_id", "created_at", "id"),
+        Index("ix_tickets_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -28,6 +34,15 @@ class Ticket(Base):
         onupdate=datetime.utcnow,
         nullable=False,
     )
+    # 标题 + 描述的全文检索向量，由数据库生成；默认不随 Ticket 一起加载
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))",
+            persisted=True,
+        ),
+        deferred=True,
+    )
 
     tags: Mapped[list["Tag"]] = relationship(
         "Tag",
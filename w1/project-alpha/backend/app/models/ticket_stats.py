@@ -0,0 +1,25 @@
+"""Counter tables maintained by database triggers (see app/db/counters.py)."""
+
+from sqlalchemy import BigInteger, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class TicketStatusCount(Base):
+    """Number of tickets per status."""
+
+    __tablename__ = "ticket_status_counts"
+
+    status: Mapped[str] = mapped_column(String(16), primary_key=True)
+    count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+
+class TagTicketCount(Base):
+    """Number of tickets carrying each tag."""
+
+    __tablename__ = "tag_ticket_counts"
+
+    # 不加外键：删除标签时级联删除 ticket_tags 会触发计数更新，外键会让其失败
+    tag_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
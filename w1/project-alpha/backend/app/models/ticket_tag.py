@@ -1,6 +1,6 @@
 """Association table between tickets and tags."""
 
-from sqlalchemy import Column, ForeignKey, Integer, UniqueConstraint, Table
+from sqlalchemy import Column, ForeignKey, Index, Integer, UniqueConstraint, Table
 
 from app.db.base import Base
 
@@ -11,6 +11,8 @@ ticket_tags = Table(
     Column("ticket_id", Integer, ForeignKey("tickets.id", ondelete="CASCADE"), primary_key=True),
     Column("tag_id", Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
     UniqueConstraint("ticket_id", "tag_id", name="uq_ticket_tag"),
+    # 反向索引：按 tag 找 ticket（标签过滤、按标签计数）
+    Index("ix_ticket_tags_tag_id_ticket_id", "tag_id", "ticket_id"),
 )
 
 
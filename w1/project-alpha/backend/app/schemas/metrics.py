@@ -0,0 +1,38 @@
+"""Pydantic schemas for runtime metrics."""
+
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class PoolStats(BaseModel):
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    wait_ms_avg: float
+    wait_ms_max: float
+
+
+class PoolConfig(BaseModel):
+    pool_size: int
+    max_overflow: int
+    pool_timeout: float
+    pool_recycle: int
+    pool_pre_ping: bool
+
+
+class PoolMetricsResponse(BaseModel):
+    config: PoolConfig
+    sync_pool: PoolStats
+    async_pool: Optional[PoolStats] = None
+
+
+class TagCacheStats(BaseModel):
+    version: int
+    size: int
+    hits: int
+    misses: int
+    hit_rate: float
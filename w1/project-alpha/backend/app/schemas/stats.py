@@ -0,0 +1,17 @@
+"""Pydantic schemas for ticket statistics."""
+
+from typing import Dict, List
+
+from pydantic import BaseModel
+
+
+class TagTicketCountOut(BaseModel):
+    id: int
+    name: str
+    count: int
+
+
+class TicketStatsResponse(BaseModel):
+    total: int
+    by_status: Dict[str, int]
+    by_tag: List[TagTicketCountOut]
@@ -1,12 +1,15 @@
 """Pydantic schemas for Ticket."""
 
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Literal, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.schemas.tag import TagOut
 
+# 单次批量请求的条目上限，大批量导入请分块提交
+BULK_MAX_ITEMS = 1000
+
 
 class TicketBase(BaseModel):
     title: str
@@ -37,6 +40,34 @@ class TicketOut(TicketBase):
 
 class TicketListResponse(BaseModel):
     items: List[TicketOut]
-    total: int
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+
+class TicketBulkCreate(BaseModel):
+    items: List[TicketCreate] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class TicketBulkUpdateItem(TicketUpdate):
+    id: int
+
+
+class TicketBulkUpdate(BaseModel):
+    items: List[TicketBulkUpdateItem] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class TicketBulkDelete(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class TicketBulkItemResult(BaseModel):
+    index: int
+    id: Optional[int] = None
+    status: Literal["created", "updated", "deleted", "not_found", "invalid"]
+    detail: Optional[str] = None
 
 
+class TicketBulkResponse(BaseModel):
+    items: List[TicketBulkItemResult]
+    succeeded: int
+    failed: int
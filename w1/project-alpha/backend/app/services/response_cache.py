@@ -0,0 +1,66 @@
+"""Short-TTL cache for serialized ticket list responses."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from app.core.config import get_settings
+
+
+class TTLCache:
+    """Thread-safe TTL cache holding at most `max_entries` values.
+
+    A non-positive `ttl` disables the cache: `get` always misses and `set`
+    is a no-op.
+    """
+
+    def __init__(self, ttl: float, max_entries: int) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_settings = get_settings()
+
+# key: 规范化后的筛选 + 分页参数；value: (etag, 已序列化的 JSON body)
+ticket_lists = TTLCache(
+    _settings.ticket_response_cache_ttl,
+    _settings.ticket_response_cache_max_entries,
+)
+
+
+def invalidate_tickets() -> None:
+    """Drop cached ticket lists after a ticket write in this process."""
+    ticket_lists.clear()
@@ -0,0 +1,25 @@
+"""Service layer for ticket statistics, read from the counter tables."""
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import TagTicketCount, TicketStatusCount
+from app.services import tag_service
+
+
+def get_ticket_stats(db: Session) -> dict:
+    """Ticket totals per status and per tag; cost is independent of table size."""
+    by_status = {
+        status: count
+        for status, count in db.execute(
+            select(TicketStatusCount.status, TicketStatusCount.count)
+            .where(TicketStatusCount.count > 0)
+            .order_by(TicketStatusCount.status)
+        ).all()
+    }
+    tag_counts = dict(db.execute(select(TagTicketCount.tag_id, TagTicketCount.count)).all())
+    by_tag = [
+        {"id": tag.id, "name": tag.name, "count": tag_counts.get(tag.id, 0)}
+        for tag in tag_service.get_tags(db)
+    ]
+    return {"total": sum(by_status.values()), "by_status": by_status, "by_tag": by_tag}
@@ -0,0 +1,245 @@
+"""Versioned in-process cache of all tags.
+
+Tags are few and change rarely, so every worker keeps the whole table in
+memory. Writers bump a version number after committing; readers reload when
+the version they loaded is no longer current. The version lives in process
+memory by default, or in Redis (``TAG_CACHE_REDIS_URL``) so that a write on
+one worker invalidates the others within ``TAG_CACHE_CHECK_INTERVAL`` seconds.
+Independently of the version, a snapshot older than ``TAG_CACHE_TTL`` seconds
+is reloaded, which bounds staleness across workers when Redis is not used.
+Reading the version never touches the network: a background thread keeps the
+Redis value in sync.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models import Tag
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedTag:
+    """Immutable snapshot of a tag row; compatible with `TagOut`."""
+
+    id: int
+    name: str
+    created_at: datetime
+
+
+class LocalVersion:
+    """Version counter shared only by threads of this process."""
+
+    def __init__(self) -> None:
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def get(self) -> int:
+        return self._value
+
+    def bump(self) -> int:
+        with self._lock:
+            self._value += 1
+            return self._value
+
+
+class RedisVersion:
+    """Version counter stored in Redis and shared by all workers.
+
+    `get` and `bump` only touch process memory. A daemon thread polls the
+    Redis counter every `interval` seconds and pushes this worker's bumps to
+    it, so a slow or unavailable Redis never blocks a request. The version is
+    the last Redis value plus the bumps not yet pushed; while Redis is down
+    it keeps moving with local writes, like `LocalVersion`.
+    """
+
+    def __init__(
+        self, url: str, interval: float, key: str = "projectalpha:tag_cache:version"
+    ) -> None:
+        try:
+            import redis
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise RuntimeError(
+                "TAG_CACHE_REDIS_URL is set but the 'redis' package is not installed"
+            ) from exc
+        self._interval = max(interval, 0.1)
+        timeout = max(self._interval, 1.0)
+        self._client = redis.Redis.from_url(
+            url, socket_timeout=timeout, socket_connect_timeout=timeout
+        )
+        self._errors = (redis.RedisError, OSError)
+        self._key = key
+        self._shared = 0
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._failing = False
+
+    def get(self) -> int:
+        self._start()
+        with self._lock:
+            return self._shared + self._pending
+
+    def bump(self) -> int:
+        self._start()
+        with self._lock:
+            self._pending += 1
+            version = self._shared + self._pending
+        self._wake.set()
+        return version
+
+    def _start(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._sync, name="tag-cache-version", daemon=True
+                )
+                self._thread.start()
+
+    def _sync(self) -> None:
+        while True:
+            self._sync_once()
+            self._wake.wait(self._interval)
+            self._wake.clear()
+
+    def _sync_once(self) -> None:
+        with self._lock:
+            pending = self._pending
+        try:
+            if pending:
+                shared = int(self._client.incrby(self._key, pending))
+            else:
+                shared = int(self._client.get(self._key) or 0)
+        except self._errors:
+            if not self._failing:
+                logger.warning("tag cache: Redis unavailable, using local versions", exc_info=True)
+            self._failing = True
+            return
+        if self._failing:
+            logger.info("tag cache: Redis reachable again")
+        self._failing = False
+        with self._lock:
+            self._pending -= pending
+            # 计数器被清空时不回退，避免版本号倒退后快照无法替换
+            self._shared = max(self._shared, shared)
+
+
+class TagCache:
+    """All tags keyed by id and by name, reloaded when the version moves."""
+
+    def __init__(self, version, ttl: float = 0.0) -> None:
+        self._version = version
+        # 快照最长存活秒数，0 表示只看版本号
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._tags: Optional[Tuple[CachedTag, ...]] = None
+        self._by_id: Dict[int, CachedTag] = {}
+        self._by_name: Dict[str, CachedTag] = {}
+        self._digest = ""
+        self._loaded_version = -1
+        self._loaded_at = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self, db: Session, version: int) -> None:
+        # 不在持锁期间访问数据库：异步模式下同一线程上的其他协程也会来取锁
+        rows = db.execute(select(Tag.id, Tag.name, Tag.created_at).order_by(Tag.name.asc())).all()
+        tags = tuple(CachedTag(id=r.id, name=r.name, created_at=r.created_at) for r in rows)
+        # 按内容计算：各 worker 数据相同则摘要相同，可用于跨 worker 一致的 ETag
+        digest = hashlib.sha1(repr([(t.id, t.name) for t in tags]).encode()).hexdigest()[:16]
+        with self._lock:
+            if version >= self._loaded_version:
+                self._tags = tags
+                self._by_id = {t.id: t for t in tags}
+                self._by_name = {t.name: t for t in tags}
+                self._digest = digest
+                self._loaded_version = version
+                self._loaded_at = time.monotonic()
+
+    def _ensure(self, db: Session, force: bool = False) -> None:
+        # 版本号在锁外读取；锁只保护比较与快照替换
+        version = self._version.get()
+        with self._lock:
+            current = (
+                not force
+                and self._tags is not None
+                and version == self._loaded_version
+                and (not self._ttl or time.monotonic() - self._loaded_at < self._ttl)
+            )
+            if current:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if not current:
+            self._load(db, version)
+
+    def all(self, db: Session) -> List[CachedTag]:
+        """All tags ordered by name."""
+        self._ensure(db)
+        return list(self._tags or ())
+
+    def get_by_name(self, db: Session, name: str) -> Optional[CachedTag]:
+        self._ensure(db)
+        return self._by_name.get(name)
+
+    def digest(self, db: Session) -> str:
+        """Content digest of the current snapshot (ids and names)."""
+        self._ensure(db)
+        return self._digest
+
+    def get_many(self, db: Session, tag_ids: Iterable[int]) -> List[CachedTag]:
+        """Tags for the given ids, in request order; unknown ids are skipped.
+
+        An id the cache has never seen may belong to a tag created on another
+        worker. Unknown ids are checked with one indexed lookup, and the cache
+        is reloaded only if some of them really exist, so bogus ids never
+        trigger a full reload.
+        """
+        tag_ids = list(dict.fromkeys(tag_ids))
+        self._ensure(db)
+        unknown = [tag_id for tag_id in tag_ids if tag_id not in self._by_id]
+        if unknown and db.scalar(select(Tag.id).where(Tag.id.in_(unknown)).limit(1)) is not None:
+            self._ensure(db, force=True)
+        by_id = self._by_id
+        return [by_id[tag_id] for tag_id in tag_ids if tag_id in by_id]
+
+    def invalidate(self) -> None:
+        """Call after committing any change to the tags table."""
+        self._version.bump()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "version": self._loaded_version,
+                "size": len(self._tags or ()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+def _build_cache() -> TagCache:
+    settings = get_settings()
+    if settings.tag_cache_redis_url:
+        return TagCache(
+            RedisVersion(settings.tag_cache_redis_url, settings.tag_cache_check_interval),
+            settings.tag_cache_ttl,
+        )
+    return TagCache(LocalVersion(), settings.tag_cache_ttl)
+
+
+cache = _build_cache()
@@ -1,21 +1,52 @@
 """Service layer for Tag operations."""
 
-from typing import List, Optional
+from typing import Iterable, List, Optional
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, make_transient_to_detached
 
 from app.models import Tag
 from app.schemas.tag import TagCreate
+from app.services import tag_cache
 
 
-def get_tags(db: Session, search: Optional[str] = None) -> List[Tag]:
-    stmt = select(Tag)
+def get_tags(db: Session, search: Optional[str] = None) -> List[tag_cache.CachedTag]:
+    tags = tag_cache.cache.all(db)
     if search:
-        like = f"%{search}%"
-        stmt = stmt.where(Tag.name.ilike(like))
-    stmt = stmt.order_by(Tag.name.asc())
-    return db.scalars(stmt).all()
+        needle = search.lower()
+        tags = [t for t in tags if needle in t.name.lower()]
+    return tags
+
+
+def get_tag_by_name(db: Session, name: str) -> Optional[tag_cache.CachedTag]:
+    return tag_cache.cache.get_by_name(db, name)
+
+
+def get_tags_by_ids(db: Session, tag_ids: Iterable[int]) -> List[tag_cache.CachedTag]:
+    return tag_cache.cache.get_many(db, tag_ids)
+
+
+def tags_version(db: Session) -> str:
+    """Digest of the cached tags; changes when a tag is added, renamed or removed."""
+    return tag_cache.cache.digest(db)
+
+
+def known_tag_ids(db: Session, tag_ids: Iterable[int]) -> set[int]:
+    """Subset of `tag_ids` that exist, answered from the tag cache."""
+    return {t.id for t in tag_cache.cache.get_many(db, tag_ids)}
+
+
+def attach_tags(db: Session, tag_ids: Iterable[int]) -> List[Tag]:
+    """Session-bound `Tag` instances for existing ids, without a SELECT.
+
+    Cached rows are turned into detached instances and merged with
+    `load=False`, which is enough to write the ticket_tags association.
+    """
+    attached = []
+    for cached in tag_cache.cache.get_many(db, tag_ids):
+        tag = Tag(id=cached.id, name=cached.name, created_at=cached.created_at)
+        make_transient_to_detached(tag)
+        attached.append(db.merge(tag, load=False))
+    return attached
 
 
 def create_tag(db: Session, tag_in: TagCreate) -> Tag:
@@ -23,6 +54,5 @@ def create_tag(db: Session, tag_in: TagCreate) -> Tag:
     db.add(tag)
     db.commit()
     db.refresh(tag)
+    tag_cache.cache.invalidate()
     return tag
-
-
@@ -0,0 +1,192 @@
+"""Ticket change feed: create/update/delete events for push clients.
+
+Service functions call `publish(db, ...)` before committing. The events are
+attached to the session and only leave it when the transaction commits:
+
+* ``memory`` backend: dispatched to this process's subscribers after commit.
+* ``postgres`` backend: sent with ``pg_notify`` inside the transaction, so
+  Postgres delivers them on commit to the `PgListener` thread of every
+  worker, which dispatches them to its own subscribers.
+"""
+
+import asyncio
+import json
+import logging
+import select as select_module
+import threading
+from dataclasses import asdict, dataclass
+from typing import Callable, Iterable, List, Optional
+
+from sqlalchemy import ARRAY, Text, bindparam, event, func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "ticket_events"
+_SESSION_KEY = "ticket_events"
+# 单个订阅者最多积压的事件数，超出后改发 resync 让客户端重新拉列表
+_QUEUE_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class TicketEvent:
+    type: str
+    id: int
+
+    def to_sse(self) -> str:
+        return f"event: ticket.{self.type}\ndata: {json.dumps(asdict(self))}\n\n"
+
+
+RESYNC = TicketEvent(type="resync", id=0)
+
+
+class EventBroker:
+    """Fans events out to the asyncio queues of SSE subscribers in this process."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._subscribers: set[tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = set()
+        self._listeners: List[Callable[[List[TicketEvent]], None]] = []
+
+    def subscribe(self) -> asyncio.Queue:
+        """Register a queue for the running event loop; pair with `unsubscribe`."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers.add((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        with self._lock:
+            self._subscribers = {s for s in self._subscribers if s[1] is not queue}
+
+    def add_listener(self, callback: Callable[[List[TicketEvent]], None]) -> None:
+        """Run `callback(events)` synchronously for every dispatched batch."""
+        self._listeners.append(callback)
+
+    def dispatch(self, events: List[TicketEvent]) -> None:
+        """Thread-safe: deliver `events` to every subscriber and listener."""
+        if not events:
+            return
+        for callback in self._listeners:
+            callback(events)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(_enqueue, queue, events)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+
+def _enqueue(queue: asyncio.Queue, events: List[TicketEvent]) -> None:
+    for item in events:
+        try:
+            queue.put_nowait(item)
+        except asyncio.QueueFull:
+            # 客户端消费太慢：丢弃积压，通知其整体刷新
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(RESYNC)
+            return
+
+
+broker = EventBroker()
+backend = get_settings().ticket_events_backend
+
+
+def publish(db: Session, kind: str, ticket_ids: Iterable[int]) -> None:
+    """Queue events on `db`; they are delivered only if the transaction commits."""
+    pending = db.info.setdefault(_SESSION_KEY, [])
+    pending.extend(TicketEvent(type=kind, id=ticket_id) for ticket_id in ticket_ids)
+
+
+@event.listens_for(Session, "before_commit")
+def _notify_before_commit(session: Session) -> None:
+    pending = session.info.get(_SESSION_KEY)
+    if backend != "postgres" or not pending:
+        return
+    payloads = [json.dumps(asdict(e)) for e in pending]
+    session.info[_SESSION_KEY] = []
+    # 一条语句发出所有 NOTIFY；Postgres 在事务提交时投递
+    session.execute(
+        select(func.pg_notify(CHANNEL, func.unnest(bindparam("payloads", type_=ARRAY(Text))))),
+        {"payloads": payloads},
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_after_commit(session: Session) -> None:
+    pending = session.info.pop(_SESSION_KEY, None)
+    if pending:
+        broker.dispatch(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(_SESSION_KEY, None)
+
+
+def _parse_payload(payload: str) -> Optional[TicketEvent]:
+    """Decode a NOTIFY payload; returns None (and logs) for anything malformed."""
+    try:
+        event = TicketEvent(**json.loads(payload))
+        if not isinstance(event.type, str) or type(event.id) is not int:
+            raise TypeError("unexpected field types")
+    except (ValueError, TypeError) as exc:
+        # 频道上的外部或损坏消息只跳过，不中断监听
+        logger.warning("ignoring malformed ticket event %r: %s", payload[:200], exc)
+        return None
+    return event
+
+
+class PgListener:
+    """Background thread that LISTENs on `CHANNEL` and feeds the broker."""
+
+    def __init__(self, engine, poll_timeout: float = 5.0) -> None:
+        self._engine = engine
+        self._poll_timeout = poll_timeout
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="ticket-events-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self._poll_timeout + 1)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._listen()
+            except Exception:  # noqa: BLE001 - keep the listener alive across DB restarts
+                logger.exception("ticket events listener failed; reconnecting")
+                self._stop.wait(1.0)
+
+    def _listen(self) -> None:
+        # 长期占用的 LISTEN 连接从池中摘出，不计入连接池容量
+        pooled = self._engine.raw_connection()
+        pooled.detach()
+        conn = pooled.dbapi_connection
+        try:
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute(f"LISTEN {CHANNEL}")
+            while not self._stop.is_set():
+                ready, _, _ = select_module.select([conn], [], [], self._poll_timeout)
+                if not ready:
+                    continue
+                conn.poll()
+                events = []
+                while conn.notifies:
+                    event = _parse_payload(conn.notifies.pop(0).payload)
+                    if event is not None:
+                        events.append(event)
+                broker.dispatch(events)
+        finally:
+            conn.close()
@@ -0,0 +1,85 @@
+"""Streaming ticket export in NDJSON and CSV formats."""
+
+import csv
+import io
+from typing import Iterable, Iterator, List, Optional
+
+from app.db.session import SessionLocal
+from app.models import Ticket
+from app.schemas.ticket import TicketOut
+from app.services.ticket_service import iter_tickets
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+CSV_HEADER = ["id", "title", "description", "status", "created_at", "updated_at", "tag_ids", "tags"]
+
+# 每攒够这么多行再向客户端写一次，减少小块写入
+_ROWS_PER_CHUNK = 500
+
+
+def _ndjson_lines(tickets: Iterable[Ticket]) -> Iterator[str]:
+    for ticket in tickets:
+        yield TicketOut.model_validate(ticket).model_dump_json() + "\n"
+
+
+def _csv_lines(tickets: Iterable[Ticket]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush() -> str:
+        value = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return value
+
+    writer.writerow(CSV_HEADER)
+    yield flush()
+    for ticket in tickets:
+        writer.writerow(
+            [
+                ticket.id,
+                ticket.title,
+                ticket.description or "",
+                ticket.status,
+                ticket.created_at.isoformat(),
+                ticket.updated_at.isoformat(),
+                ";".join(str(tag.id) for tag in ticket.tags),
+                ";".join(tag.name for tag in ticket.tags),
+            ]
+        )
+        yield flush()
+
+
+def _chunked(lines: Iterable[str]) -> Iterator[bytes]:
+    chunk: List[str] = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= _ROWS_PER_CHUNK:
+            yield "".join(chunk).encode()
+            chunk = []
+    if chunk:
+        yield "".join(chunk).encode()
+
+
+def stream_tickets(
+    fmt: str,
+    *,
+    tag_ids: Optional[List[int]] = None,
+    search: Optional[str] = None,
+    status: Optional[str] = None,
+    search_mode: str = "title",
+) -> Iterator[bytes]:
+    """Yield the encoded export body chunk by chunk.
+
+    The generator owns its own session: a StreamingResponse body is consumed
+    after request dependencies have been torn down.
+    """
+    with SessionLocal() as db:
+        tickets = iter_tickets(
+            db, tag_ids=tag_ids, search=search, status=status, search_mode=search_mode
+        )
+        lines = _csv_lines(tickets) if fmt == "csv" else _ndjson_lines(tickets)
+        yield from _chunked(lines)
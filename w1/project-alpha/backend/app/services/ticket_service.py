@@ -1,12 +1,96 @@
 """Service layer for Ticket operations."""
 
-from typing import List, Optional, Sequence
+import base64
+from datetime import datetime
+from typing import Iterator, List, NamedTuple, Optional, Union
 
-from sqlalchemy import and_, func, select
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, cast, delete, exists, func, insert, select, tuple_, update
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.orm import Session, selectinload
 
-from app.models import Ticket, Tag, ticket_tags
-from app.schemas.ticket import TicketCreate, TicketUpdate
+from app.models import TagTicketCount, Ticket, ticket_tags
+from app.schemas.ticket import (
+    TicketBulkItemResult,
+    TicketBulkUpdateItem,
+    TicketCreate,
+    TicketUpdate,
+)
+from app.services import response_cache, tag_service, ticket_events
+
+
+class TicketPage(NamedTuple):
+    # lean 模式下为与 TicketOut 字段一致的 dict
+    items: Union[List[Ticket], List[dict]]
+    total: Optional[int]
+    next_cursor: Optional[str]
+    # 整个筛选结果集的 max(updated_at)，仅在窗口函数计算了 total 时可用
+    last_modified: Optional[datetime] = None
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(created_at: datetime, ticket_id: int) -> str:
+    """Build an opaque keyset cursor from the last ticket of a page."""
+    raw = f"{created_at.isoformat()}|{ticket_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor produced by `encode_cursor` into (created_at, id)."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        created_part, id_part = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_part), int(id_part)
+    except ValueError as exc:
+        raise InvalidCursorError("Invalid cursor") from exc
+
+
+def _fulltext_query(search: str):
+    # 配置需与 tickets.search_vector 生成列保持一致
+    return func.websearch_to_tsquery(cast("simple", REGCONFIG), search)
+
+
+# EXISTS 每次索引探测相对 GROUP BY 聚合一行的代价估计
+_EXISTS_PROBE_COST = 4
+
+
+def tag_cardinalities(db: Session, tag_ids: List[int]) -> dict[int, int]:
+    """Return how many tickets carry each tag (0 for unused or unknown tags)."""
+    # 读触发器维护的计数表，不再对 ticket_tags 做 GROUP BY
+    stmt = select(TagTicketCount.tag_id, TagTicketCount.count).where(
+        TagTicketCount.tag_id.in_(tag_ids)
+    )
+    counts = {tag_id: 0 for tag_id in tag_ids}
+    counts.update({tag_id: count for tag_id, count in db.execute(stmt).all()})
+    return counts
+
+
+def plan_tag_filter(db: Session, tag_ids: List[int]) -> tuple[List[int], str]:
+    """Order tag ids rarest first and pick the AND strategy from per-tag counts.
+
+    Strategies: "group" joins ticket_tags and uses GROUP BY/HAVING, which
+    aggregates every association row of every requested tag; "exists" chains
+    one EXISTS per tag so the rarest tag drives the scan and the others are
+    index probes.
+
+    Counts only pick a strategy and never decide the result: a zero or
+    missing counter (migration not applied, drift) falls back to "group",
+    which reads ticket_tags through its tag_id index and is cheap when the
+    tag really has no tickets.
+    """
+    counts = tag_cardinalities(db, list(dict.fromkeys(tag_ids)))
+    ordered = sorted(counts, key=counts.__getitem__)
+    rarest = counts[ordered[0]]
+    if rarest == 0:
+        return ordered, "group"
+    if len(ordered) == 1:
+        return ordered, "exists"
+    group_cost = sum(counts.values())
+    exists_cost = rarest * (len(ordered) - 1) * _EXISTS_PROBE_COST
+    return ordered, "exists" if exists_cost < group_cost else "group"
 
 
 def _apply_ticket_filters(
@@ -14,15 +98,28 @@ def _apply_ticket_filters(
     tag_ids: Optional[List[int]] = None,
     search: Optional[str] = None,
     status: Optional[str] = None,
+    search_mode: str = "title",
+    tag_strategy: str = "group",
 ):
     if status:
         stmt = stmt.where(Ticket.status == status)
 
-    if search:
+    if search and search_mode == "fulltext":
+        stmt = stmt.where(Ticket.search_vector.bool_op("@@")(_fulltext_query(search)))
+    elif search:
         like = f"%{search}%"
         stmt = stmt.where(Ticket.title.ilike(like))
 
-    if tag_ids:
+    if tag_ids and tag_strategy == "exists":
+        # AND 逻辑：按 tag_ids 顺序（最稀有的在前）逐个 EXISTS
+        for tag_id in tag_ids:
+            stmt = stmt.where(
+                exists().where(
+                    ticket_tags.c.ticket_id == Ticket.id,
+                    ticket_tags.c.tag_id == tag_id,
+                )
+            )
+    elif tag_ids:
         # AND 逻辑：ticket 必须同时包含所有 tag_ids
         stmt = (
             stmt.join(ticket_tags, Ticket.id == ticket_tags.c.ticket_id)
@@ -33,6 +130,69 @@ def _apply_ticket_filters(
     return stmt
 
 
+def _tag_ids_column():
+    # 用独立别名，避免 group 策略下与外层 join 的 ticket_tags 被自动关联
+    tt = ticket_tags.alias("tt")
+    tag_ids = (
+        select(tt.c.tag_id)
+        .where(tt.c.ticket_id == Ticket.id)
+        .order_by(tt.c.tag_id)
+        .scalar_subquery()
+    )
+    return func.array(tag_ids).label("tag_ids")
+
+
+_LEAN_COLUMNS = (
+    Ticket.title,
+    Ticket.description,
+    Ticket.id,
+    Ticket.status,
+    Ticket.created_at,
+    Ticket.updated_at,
+)
+
+
+def _lean_items(db: Session, rows) -> List[dict]:
+    """Build `TicketOut`-shaped dicts from plain rows, tags from the tag cache."""
+    tag_ids = {tag_id for row in rows for tag_id in row.tag_ids}
+    tags_by_id = {
+        tag.id: {"name": tag.name, "id": tag.id, "created_at": tag.created_at}
+        for tag in tag_service.get_tags_by_ids(db, tag_ids)
+    }
+    # 键顺序与 TicketOut / TagOut 的字段顺序一致，序列化结果逐字节相同
+    return [
+        {
+            "title": row.title,
+            "description": row.description,
+            "id": row.id,
+            "status": row.status,
+            "created_at": row.created_at,
+            "updated_at": row.updated_at,
+            "tags": [tags_by_id[tag_id] for tag_id in row.tag_ids if tag_id in tags_by_id],
+        }
+        for row in rows
+    ]
+
+
+def count_tickets(
+    db: Session,
+    *,
+    tag_ids: Optional[List[int]] = None,
+    search: Optional[str] = None,
+    status: Optional[str] = None,
+    search_mode: str = "title",
+    tag_strategy: Optional[str] = None,
+) -> int:
+    """Count tickets matching the filters with a standalone statement."""
+    if tag_ids and tag_strategy is None:
+        tag_ids, tag_strategy = plan_tag_filter(db, tag_ids)
+    # 标签过滤可能带 GROUP BY，需要先包一层子查询再计数
+    filtered = _apply_ticket_filters(
+        select(Ticket.id), tag_ids, search, status, search_mode, tag_strategy or "group"
+    ).subquery()
+    return int(db.scalar(select(func.count()).select_from(filtered)) or 0)
+
+
 def list_tickets(
     db: Session,
     *,
@@ -41,44 +201,178 @@ def list_tickets(
     status: Optional[str] = None,
     limit: int = 50,
     offset: int = 0,
-) -> tuple[List[Ticket], int]:
-    base_stmt = select(Ticket).order_by(Ticket.created_at.desc())
-    base_stmt = _apply_ticket_filters(base_stmt, tag_ids, search, status)
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    search_mode: str = "title",
+    tag_strategy: Optional[str] = None,
+    lean: bool = False,
+) -> TicketPage:
+    """Return a page of tickets, the filtered total and the next cursor.
 
-    items: Sequence[Ticket] = db.scalars(
-        base_stmt.offset(offset).limit(limit)
-    ).all()
+    When `cursor` is given the page seeks past (created_at, id) of the
+    previous page instead of skipping `offset` rows. Offset pages read the
+    total from `count(*) OVER ()` in the same statement; cursor pages need a
+    separate count, so infinite-scroll clients should pass
+    `include_total=False` and get `None` back.
+
+    With `search_mode="fulltext"` the search term is matched against title
+    and description and results are ranked by `ts_rank`; such pages can
+    only be paged by offset, so `next_cursor` is always None.
+
+    Tag filters use AND semantics; `tag_strategy` is normally left as None
+    so `plan_tag_filter` picks one from per-tag counts.
+
+    With `lean=True` no ORM objects are built: ticket columns and an array
+    of tag ids are selected as plain rows and returned as dicts shaped like
+    `TicketOut`, with tag names filled in from the tag cache.
+    """
+    if tag_ids and tag_strategy is None:
+        tag_ids, tag_strategy = plan_tag_filter(db, tag_ids)
 
-    count_stmt = select(func.count(func.distinct(Ticket.id)))
-    count_stmt = _apply_ticket_filters(count_stmt, tag_ids, search, status)
-    total = db.scalar(count_stmt) or 0
+    order_by = [Ticket.created_at.desc(), Ticket.id.desc()]
+    ranked = bool(search) and search_mode == "fulltext"
+    if ranked:
+        if cursor:
+            raise InvalidCursorError("Cursor pagination is not supported for full-text search")
+        rank = func.ts_rank(Ticket.search_vector, _fulltext_query(search))
+        order_by.insert(0, rank.desc())
 
-    # 预加载 tags
-    for t in items:
-        _ = t.tags  # access relationship
+    window_total = include_total and not cursor
+    columns = [*_LEAN_COLUMNS, _tag_ids_column()] if lean else [Ticket]
+    if window_total:
+        columns += [
+            func.count().over().label("total"),
+            func.max(Ticket.updated_at).over().label("last_modified"),
+        ]
+    base_stmt = select(*columns).order_by(*order_by)
+    if not lean:
+        base_stmt = base_stmt.options(selectinload(Ticket.tags))
+    base_stmt = _apply_ticket_filters(
+        base_stmt, tag_ids, search, status, search_mode, tag_strategy or "group"
+    )
+
+    if cursor:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        base_stmt = base_stmt.where(
+            tuple_(Ticket.created_at, Ticket.id) < tuple_(cursor_created_at, cursor_id)
+        )
+    else:
+        base_stmt = base_stmt.offset(offset)
+
+    # 多取一行，用来判断是否还有下一页
+    rows = db.execute(base_stmt.limit(limit + 1)).all()
+    page_rows = rows[:limit]
+    if lean:
+        items = _lean_items(db, page_rows)
+        last = page_rows[-1] if page_rows else None
+    else:
+        items = [row[0] for row in page_rows]
+        last = items[-1] if items else None
+    next_cursor = None
+    # 按相关度排序的页不能用 (created_at, id) 游标续页
+    if len(rows) > limit and last is not None and not ranked:
+        next_cursor = encode_cursor(last.created_at, last.id)
+
+    total: Optional[int] = None
+    last_modified: Optional[datetime] = None
+    if window_total and rows:
+        total = int(rows[0].total)
+        last_modified = rows[0].last_modified
+    elif window_total and offset == 0:
+        total = 0
+    elif include_total:
+        # cursor 页或 offset 越界时窗口函数拿不到总数，补一次独立计数
+        total = count_tickets(
+            db,
+            tag_ids=tag_ids,
+            search=search,
+            status=status,
+            search_mode=search_mode,
+            tag_strategy=tag_strategy,
+        )
 
-    return list(items), int(total)
+    return TicketPage(items, total, next_cursor, last_modified)
+
+
+def ticket_list_fingerprint(
+    db: Session,
+    *,
+    tag_ids: Optional[List[int]] = None,
+    search: Optional[str] = None,
+    status: Optional[str] = None,
+    search_mode: str = "title",
+    tag_strategy: Optional[str] = None,
+) -> tuple[Optional[datetime], int]:
+    """max(updated_at) and row count of the filtered set, for list ETags.
+
+    Together they change on every create, update or delete that touches the
+    set, because writes always bump `updated_at`.
+    """
+    if tag_ids and tag_strategy is None:
+        tag_ids, tag_strategy = plan_tag_filter(db, tag_ids)
+    filtered = _apply_ticket_filters(
+        select(Ticket.id, Ticket.updated_at),
+        tag_ids,
+        search,
+        status,
+        search_mode,
+        tag_strategy or "group",
+    ).subquery()
+    last_modified, count = db.execute(
+        select(func.max(filtered.c.updated_at), func.count()).select_from(filtered)
+    ).one()
+    return last_modified, int(count)
+
+
+def ticket_last_modified(db: Session, ticket_id: int) -> Optional[datetime]:
+    return db.scalar(select(Ticket.updated_at).where(Ticket.id == ticket_id))
+
+
+def iter_tickets(
+    db: Session,
+    *,
+    tag_ids: Optional[List[int]] = None,
+    search: Optional[str] = None,
+    status: Optional[str] = None,
+    search_mode: str = "title",
+    batch_size: int = 1000,
+) -> Iterator[Ticket]:
+    """Yield every matching ticket, newest first, with tags loaded.
+
+    Rows are fetched `batch_size` at a time through a server-side cursor
+    (`yield_per`), and tags are selectin-loaded per batch, so memory stays
+    flat regardless of how many tickets match.
+    """
+    tag_strategy = "group"
+    if tag_ids:
+        tag_ids, tag_strategy = plan_tag_filter(db, tag_ids)
+    stmt = (
+        select(Ticket)
+        .options(selectinload(Ticket.tags))
+        .order_by(Ticket.created_at.desc(), Ticket.id.desc())
+    )
+    stmt = _apply_ticket_filters(stmt, tag_ids, search, status, search_mode, tag_strategy)
+    yield from db.scalars(stmt.execution_options(yield_per=batch_size))
 
 
 def get_ticket(db: Session, ticket_id: int) -> Optional[Ticket]:
-    stmt = select(Ticket).where(Ticket.id == ticket_id)
-    ticket = db.scalar(stmt)
-    if ticket:
-        _ = ticket.tags
-    return ticket
+    # tags 通过 selectinload 一次性加载，避免逐条 lazy load
+    stmt = select(Ticket).options(selectinload(Ticket.tags)).where(Ticket.id == ticket_id)
+    return db.scalar(stmt)
 
 
 def create_ticket(db: Session, ticket_in: TicketCreate) -> Ticket:
     ticket = Ticket(title=ticket_in.title, description=ticket_in.description)
     if ticket_in.tag_ids:
-        tags = db.scalars(select(Tag).where(Tag.id.in_(ticket_in.tag_ids))).all()
-        ticket.tags = list(tags)
+        ticket.tags = tag_service.attach_tags(db, ticket_in.tag_ids)
 
     db.add(ticket)
+    db.flush()
+    ticket_id = ticket.id
+    ticket_events.publish(db, "created", [ticket_id])
     db.commit()
-    db.refresh(ticket)
-    _ = ticket.tags
-    return ticket
+    response_cache.invalidate_tickets()
+    return get_ticket(db, ticket_id)
 
 
 def update_ticket(
@@ -100,14 +394,15 @@ def update_ticket(
         ticket.status = data["status"]
 
     if "tag_ids" in data and data["tag_ids"] is not None:
-        tags = db.scalars(select(Tag).where(Tag.id.in_(data["tag_ids"]))).all()
-        ticket.tags = list(tags)
+        ticket.tags = tag_service.attach_tags(db, data["tag_ids"])
 
+    # 只改标签时 onupdate 不会触发，显式刷新以保证 ETag 变化
+    ticket.updated_at = datetime.utcnow()
     db.add(ticket)
+    ticket_events.publish(db, "updated", [ticket_id])
     db.commit()
-    db.refresh(ticket)
-    _ = ticket.tags
-    return ticket
+    response_cache.invalidate_tickets()
+    return get_ticket(db, ticket_id)
 
 
 def delete_ticket(db: Session, ticket_id: int) -> bool:
@@ -115,7 +410,141 @@ def delete_ticket(db: Session, ticket_id: int) -> bool:
     if not ticket:
         return False
     db.delete(ticket)
+    ticket_events.publish(db, "deleted", [ticket_id])
     db.commit()
+    response_cache.invalidate_tickets()
     return True
 
 
+def _existing_ticket_ids(db: Session, ticket_ids) -> set[int]:
+    ticket_ids = set(ticket_ids)
+    if not ticket_ids:
+        return set()
+    return set(db.scalars(select(Ticket.id).where(Ticket.id.in_(ticket_ids))).all())
+
+
+def _insert_ticket_tags(db: Session, pairs: List[tuple[int, List[int]]], known_tag_ids: set[int]):
+    rows = [
+        {"ticket_id": ticket_id, "tag_id": tag_id}
+        for ticket_id, tag_ids in pairs
+        for tag_id in dict.fromkeys(tag_ids)
+        if tag_id in known_tag_ids
+    ]
+    if rows:
+        db.execute(insert(ticket_tags), rows)
+
+
+def bulk_create_tickets(db: Session, tickets_in: List[TicketCreate]) -> List[TicketBulkItemResult]:
+    """Create many tickets in one transaction with multi-row INSERTs.
+
+    Unknown tag ids are ignored, as in `create_ticket`.
+    """
+    known_tag_ids = tag_service.known_tag_ids(db, (t for ti in tickets_in for t in ti.tag_ids or []))
+    new_ids = db.scalars(
+        insert(Ticket).returning(Ticket.id, sort_by_parameter_order=True),
+        [{"title": t.title, "description": t.description} for t in tickets_in],
+    ).all()
+    _insert_ticket_tags(
+        db,
+        [(ticket_id, t.tag_ids or []) for ticket_id, t in zip(new_ids, tickets_in)],
+        known_tag_ids,
+    )
+    ticket_events.publish(db, "created", new_ids)
+    db.commit()
+    response_cache.invalidate_tickets()
+    return [
+        TicketBulkItemResult(index=i, id=ticket_id, status="created")
+        for i, ticket_id in enumerate(new_ids)
+    ]
+
+
+def bulk_update_tickets(
+    db: Session,
+    patches: List[TicketBulkUpdateItem],
+) -> List[TicketBulkItemResult]:
+    """Apply many ticket patches in one transaction.
+
+    Column changes go out as executemany UPDATEs by primary key; tickets
+    whose `tag_ids` are given get their associations replaced with one
+    DELETE and one multi-row INSERT.
+    """
+    existing = _existing_ticket_ids(db, (p.id for p in patches))
+    known_tag_ids = tag_service.known_tag_ids(db, (t for p in patches for t in p.tag_ids or []))
+    now = datetime.utcnow()
+
+    results: List[TicketBulkItemResult] = []
+    column_rows: List[dict] = []
+    tag_pairs: List[tuple[int, List[int]]] = []
+    seen: set[int] = set()
+    for i, patch in enumerate(patches):
+        data = patch.model_dump(exclude_unset=True, exclude={"id"})
+        if patch.id not in existing:
+            results.append(TicketBulkItemResult(index=i, id=patch.id, status="not_found"))
+            continue
+        if patch.id in seen:
+            results.append(
+                TicketBulkItemResult(
+                    index=i, id=patch.id, status="invalid", detail="Duplicate id in batch"
+                )
+            )
+            continue
+        if any(field in data and data[field] is None for field in ("title", "status")):
+            results.append(
+                TicketBulkItemResult(
+                    index=i, id=patch.id, status="invalid", detail="title and status cannot be null"
+                )
+            )
+            continue
+
+        seen.add(patch.id)
+        tag_ids = data.pop("tag_ids", None)
+        # 即使只改标签也刷新 updated_at
+        column_rows.append({"id": patch.id, "updated_at": now, **data})
+        if tag_ids is not None:
+            tag_pairs.append((patch.id, tag_ids))
+        results.append(TicketBulkItemResult(index=i, id=patch.id, status="updated"))
+
+    if column_rows:
+        db.execute(update(Ticket), column_rows)
+    if tag_pairs:
+        db.execute(
+            delete(ticket_tags).where(ticket_tags.c.ticket_id.in_([t for t, _ in tag_pairs]))
+        )
+        _insert_ticket_tags(db, tag_pairs, known_tag_ids)
+    ticket_events.publish(db, "updated", [row["id"] for row in column_rows])
+    db.commit()
+    response_cache.invalidate_tickets()
+    return results
+
+
+def bulk_delete_tickets(db: Session, ticket_ids: List[int]) -> List[TicketBulkItemResult]:
+    """Delete many tickets with one statement; ticket_tags rows cascade in the database.
+
+    An id repeated in the batch is reported as invalid after its first occurrence.
+    """
+    deleted = set(
+        db.scalars(
+            delete(Ticket)
+            .where(Ticket.id.in_(set(ticket_ids)))
+            .returning(Ticket.id)
+            .execution_options(synchronize_session=False)
+        ).all()
+    )
+    ticket_events.publish(db, "deleted", sorted(deleted))
+    db.commit()
+    response_cache.invalidate_tickets()
+
+    results: List[TicketBulkItemResult] = []
+    seen: set[int] = set()
+    for i, ticket_id in enumerate(ticket_ids):
+        if ticket_id in seen:
+            results.append(
+                TicketBulkItemResult(
+                    index=i, id=ticket_id, status="invalid", detail="Duplicate id in batch"
+                )
+            )
+            continue
+        seen.add(ticket_id)
+        status = "deleted" if ticket_id in deleted else "not_found"
+        results.append(TicketBulkItemResult(index=i, id=ticket_id, status=status))
+    return results
@@ -0,0 +1 @@
+"""Ad-hoc benchmarks run against a scratch database."""
@@ -0,0 +1,96 @@
+"""Benchmark the ORM and lean ticket list paths, query plus JSON encoding.
+
+Pages are fetched without `total` so the count over the whole table does not
+drown out the per-row cost that differs between the two paths.
+
+Run from the backend directory against a scratch database (it inserts rows):
+
+    DATABASE_URL=postgresql://.../projectalpha_bench python -m bench.list_bench --limit 200
+"""
+
+import argparse
+import statistics
+import time
+
+from sqlalchemy import text
+
+from app.api import http_cache
+from app.db.init_db import init_db
+from app.db.session import SessionLocal, engine
+from app.schemas.ticket import TicketListResponse
+from app.services import ticket_service
+from bench.search_bench import seed
+
+TAG_NAMES = [f"bench-{i}" for i in range(8)]
+
+
+def seed_tags(tickets: int) -> None:
+    """Attach each bench tag to roughly a third of the newest `tickets` tickets."""
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO tags (name, created_at) SELECT unnest(CAST(:names AS text[])), now() "
+                "ON CONFLICT DO NOTHING"
+            ),
+            {"names": TAG_NAMES},
+        )
+        conn.execute(
+            text(
+                """
+                INSERT INTO ticket_tags (ticket_id, tag_id)
+                SELECT t.id, g.id
+                FROM (SELECT id FROM tickets ORDER BY created_at DESC, id DESC LIMIT :tickets) t
+                JOIN tags g ON g.name = ANY(CAST(:names AS text[])) AND random() < 0.35
+                ON CONFLICT DO NOTHING
+                """
+            ),
+            {"tickets": tickets, "names": TAG_NAMES},
+        )
+
+
+def orm_page(db, limit: int) -> bytes:
+    page = ticket_service.list_tickets(db, limit=limit, include_total=False)
+    return TicketListResponse(
+        items=page.items, total=page.total, next_cursor=page.next_cursor
+    ).model_dump_json().encode()
+
+
+def lean_page(db, limit: int) -> bytes:
+    page = ticket_service.list_tickets(db, limit=limit, include_total=False, lean=True)
+    return http_cache.dump_json(
+        {"items": page.items, "total": page.total, "next_cursor": page.next_cursor}
+    )
+
+
+def run(render, repeat: int, limit: int) -> list[float]:
+    timings = []
+    with SessionLocal() as db:
+        render(db, limit)  # 预热：加载标签缓存、建立连接
+        for _ in range(repeat):
+            start = time.perf_counter()
+            render(db, limit)
+            timings.append((time.perf_counter() - start) * 1000)
+            db.expunge_all()
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=200)
+    args = parser.parse_args()
+
+    init_db()
+    seed(args.rows)
+    seed_tags(args.limit * 5)
+
+    print(f"{'path':<8}{'p50 ms':>10}{'p95 ms':>10}")
+    for name, render in (("orm", orm_page), ("lean", lean_page)):
+        timings = sorted(run(render, args.repeat, args.limit))
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        print(f"{name:<8}{statistics.median(timings):>10.1f}{p95:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Benchmark ticket search modes on a large synthetic table.
+
+Run from the backend directory against a scratch database (it inserts rows):
+
+    DATABASE_URL=postgresql://.../projectalpha_bench python -m bench.search_bench --rows 1000000
+"""
+
+import argparse
+import statistics
+import time
+
+from sqlalchemy import func, select, text
+
+from app.db.init_db import init_db
+from app.db.session import SessionLocal, engine
+from app.models import Ticket
+from app.services import ticket_service
+
+WORDS = [
+    "autocomplete", "payments", "onboarding", "android", "ios", "webhook",
+    "dashboard", "latency", "refactor", "crash", "export", "search",
+    "notification", "pipeline", "cache", "billing", "login", "profile",
+]
+
+
+def seed(rows: int) -> None:
+    """Top the tickets table up to `rows` rows of pseudo-random text."""
+    with SessionLocal() as db:
+        existing = db.scalar(select(func.count()).select_from(Ticket)) or 0
+    missing = rows - existing
+    if missing <= 0:
+        return
+    words = "ARRAY[" + ",".join(f"'{w}'" for w in WORDS) + "]"
+    pick = f"({words})[1 + floor(random() * {len(WORDS)})::int]"
+    print(f"Seeding {missing} tickets ...")
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                f"""
+                INSERT INTO tickets (title, description, status, created_at, updated_at)
+                SELECT {pick} || ' ' || {pick} || ' #' || g,
+                       'Investigate ' || {pick} || ' and ' || {pick} || ' for case ' || g,
+                       CASE WHEN random() < 0.7 THEN 'open' ELSE 'done' END,
+                       now() - (g || ' seconds')::interval,
+                       now()
+                FROM generate_series(1, :missing) AS g
+                """
+            ),
+            {"missing": missing},
+        )
+        conn.execute(text("ANALYZE tickets"))
+
+
+def run(term: str, mode: str, repeat: int, limit: int) -> list[float]:
+    timings = []
+    with SessionLocal() as db:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            ticket_service.list_tickets(db, search=term, search_mode=mode, limit=limit)
+            timings.append((time.perf_counter() - start) * 1000)
+            db.expunge_all()
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--terms", nargs="+", default=["webhook", "crash export", "zzz-missing"])
+    args = parser.parse_args()
+
+    init_db()
+    seed(args.rows)
+
+    print(f"{'term':<16}{'mode':<10}{'p50 ms':>10}{'p95 ms':>10}")
+    for term in args.terms:
+        for mode in ("title", "fulltext"):
+            timings = sorted(run(term, mode, args.repeat, args.limit))
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            print(f"{term:<16}{mode:<10}{statistics.median(timings):>10.1f}{p95:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
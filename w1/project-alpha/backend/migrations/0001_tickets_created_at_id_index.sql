@@ -0,0 +1,4 @@
+-- Keyset pagination index for GET /api/tickets?cursor=...
+-- 对应 ORDER BY created_at DESC, id DESC；CONCURRENTLY 不能放在事务里执行。
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tickets_created_at_id
+    ON tickets (created_at, id);
@@ -0,0 +1,10 @@
+-- Full-text search over ticket title + description (GET /api/tickets?search_mode=fulltext).
+-- 添加 STORED 生成列会重写 tickets 表并持有排他锁，请在低峰期执行。
+ALTER TABLE tickets
+    ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))
+    ) STORED;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tickets_search_vector
+    ON tickets USING gin (search_vector);
@@ -0,0 +1,3 @@
+-- Reverse index for tag filters: look up tickets by tag_id.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_ticket_tags_tag_id_ticket_id
+    ON ticket_tags (tag_id, ticket_id);
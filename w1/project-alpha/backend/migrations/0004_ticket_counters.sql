@@ -0,0 +1,87 @@
+-- Incrementally maintained ticket counters (per status, per tag).
+-- Also applied by `python -m app.db.init_db`; this file is the only copy of the trigger DDL.
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS ticket_status_counts (
+    status VARCHAR(16) PRIMARY KEY,
+    count BIGINT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS tag_ticket_counts (
+    tag_id INTEGER PRIMARY KEY,
+    count BIGINT NOT NULL
+);
+
+-- Block writers while triggers are installed and counts backfilled.
+LOCK TABLE tickets, ticket_tags IN SHARE ROW EXCLUSIVE MODE;
+
+CREATE OR REPLACE FUNCTION ticket_status_counts_apply() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO ticket_status_counts AS c (status, count)
+        SELECT status, count(*) FROM new_rows GROUP BY status ORDER BY status
+        ON CONFLICT (status) DO UPDATE SET count = c.count + EXCLUDED.count;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO ticket_status_counts AS c (status, count)
+        SELECT status, -count(*) FROM old_rows GROUP BY status ORDER BY status
+        ON CONFLICT (status) DO UPDATE SET count = c.count + EXCLUDED.count;
+    ELSE
+        INSERT INTO ticket_status_counts AS c (status, count)
+        SELECT status, sum(delta) FROM (
+            SELECT status, 1 AS delta FROM new_rows
+            UNION ALL
+            SELECT status, -1 AS delta FROM old_rows
+        ) d
+        GROUP BY status HAVING sum(delta) <> 0 ORDER BY status
+        ON CONFLICT (status) DO UPDATE SET count = c.count + EXCLUDED.count;
+    END IF;
+    RETURN NULL;
+END $$;
+
+CREATE OR REPLACE FUNCTION tag_ticket_counts_apply() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO tag_ticket_counts AS c (tag_id, count)
+        SELECT tag_id, count(*) FROM new_rows GROUP BY tag_id ORDER BY tag_id
+        ON CONFLICT (tag_id) DO UPDATE SET count = c.count + EXCLUDED.count;
+    ELSE
+        INSERT INTO tag_ticket_counts AS c (tag_id, count)
+        SELECT tag_id, -count(*) FROM old_rows GROUP BY tag_id ORDER BY tag_id
+        ON CONFLICT (tag_id) DO UPDATE SET count = c.count + EXCLUDED.count;
+    END IF;
+    RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS tickets_counts_insert ON tickets;
+CREATE TRIGGER tickets_counts_insert AFTER INSERT ON tickets
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION ticket_status_counts_apply();
+DROP TRIGGER IF EXISTS tickets_counts_update ON tickets;
+CREATE TRIGGER tickets_counts_update AFTER UPDATE ON tickets
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION ticket_status_counts_apply();
+DROP TRIGGER IF EXISTS tickets_counts_delete ON tickets;
+CREATE TRIGGER tickets_counts_delete AFTER DELETE ON tickets
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION ticket_status_counts_apply();
+
+DROP TRIGGER IF EXISTS ticket_tags_counts_insert ON ticket_tags;
+CREATE TRIGGER ticket_tags_counts_insert AFTER INSERT ON ticket_tags
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION tag_ticket_counts_apply();
+DROP TRIGGER IF EXISTS ticket_tags_counts_delete ON ticket_tags;
+CREATE TRIGGER ticket_tags_counts_delete AFTER DELETE ON ticket_tags
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION tag_ticket_counts_apply();
+
+DELETE FROM ticket_status_counts;
+INSERT INTO ticket_status_counts (status, count)
+SELECT status, count(*) FROM tickets GROUP BY status;
+
+DELETE FROM tag_ticket_counts;
+INSERT INTO tag_ticket_counts (tag_id, count)
+SELECT tag_id, count(*) FROM ticket_tags GROUP BY tag_id;
+
+COMMIT;
@@ -0,0 +1,76 @@
+"""Shared fixtures for tests that run against the configured Postgres database.
+
+The tests write a handful of rows tagged with a unique prefix and remove them
+afterwards; point `DATABASE_URL` at a development or throwaway database.
+"""
+
+import uuid
+
+import pytest
+from sqlalchemy import delete, event, insert
+from sqlalchemy.exc import OperationalError
+
+from app.db.init_db import init_db
+from app.db.session import SessionLocal, engine
+from app.models import Tag, Ticket, ticket_tags
+from app.services import tag_cache
+
+
+@pytest.fixture(scope="session")
+def database():
+    try:
+        init_db()
+    except OperationalError as exc:
+        pytest.skip(f"database not reachable: {exc.orig}")
+    return engine
+
+
+@pytest.fixture
+def db(database):
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def seeded_tickets(database):
+    """Insert 60 tickets with two tags each; yields (title prefix, ticket ids)."""
+    prefix = f"stmt-count-{uuid.uuid4().hex[:8]}"
+    with database.begin() as conn:
+        tag_ids = conn.scalars(
+            insert(Tag).returning(Tag.id),
+            [{"name": f"{prefix}-a"}, {"name": f"{prefix}-b"}],
+        ).all()
+        ticket_ids = conn.scalars(
+            insert(Ticket).returning(Ticket.id),
+            [{"title": f"{prefix} #{i}", "description": "seeded"} for i in range(60)],
+        ).all()
+        conn.execute(
+            insert(ticket_tags),
+            [{"ticket_id": t, "tag_id": g} for t in ticket_ids for g in tag_ids],
+        )
+    tag_cache.cache.invalidate()
+    yield prefix, ticket_ids
+    with database.begin() as conn:
+        conn.execute(delete(Ticket).where(Ticket.id.in_(ticket_ids)))
+        conn.execute(delete(Tag).where(Tag.id.in_(tag_ids)))
+    tag_cache.cache.invalidate()
+
+
+class StatementCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args):
+        self.count += 1
+
+
+@pytest.fixture
+def count_statements(database):
+    """Count statements sent to the database while the returned counter is live."""
+    counter = StatementCounter()
+    event.listen(database, "before_cursor_execute", counter)
+    yield counter
+    event.remove(database, "before_cursor_execute", counter)
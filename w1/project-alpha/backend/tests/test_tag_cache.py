@@ -0,0 +1,47 @@
+"""Versioned tag cache."""
+
+import time
+
+from sqlalchemy import delete, insert
+
+from app.models import Tag
+from app.services.tag_cache import LocalVersion, TagCache
+
+
+def test_unknown_ids_do_not_reload(db, seeded_tickets, count_statements):
+    cache = TagCache(LocalVersion())
+    cache.all(db)
+    misses = cache.misses
+
+    count_statements.count = 0
+    assert cache.get_many(db, [-1, -2]) == []
+    # 一条按主键确认的查询，不重新加载整张表
+    assert count_statements.count == 1
+    assert cache.misses == misses
+
+
+def test_unknown_existing_id_is_loaded(db, database):
+    cache = TagCache(LocalVersion())
+    cache.all(db)
+    with database.begin() as conn:
+        tag_id = conn.scalar(insert(Tag).returning(Tag.id), {"name": "tag-cache-unknown"})
+    try:
+        assert [t.id for t in cache.get_many(db, [tag_id])] == [tag_id]
+    finally:
+        with database.begin() as conn:
+            conn.execute(delete(Tag).where(Tag.id == tag_id))
+
+
+def test_ttl_bounds_staleness_without_invalidation(db, database):
+    # 模拟其他 worker 的写入：本进程的版本号不变
+    cache = TagCache(LocalVersion(), ttl=0.2)
+    before = {t.name for t in cache.all(db)}
+    with database.begin() as conn:
+        tag_id = conn.scalar(insert(Tag).returning(Tag.id), {"name": "tag-cache-ttl"})
+    try:
+        assert {t.name for t in cache.all(db)} == before
+        time.sleep(0.25)
+        assert "tag-cache-ttl" in {t.name for t in cache.all(db)}
+    finally:
+        with database.begin() as conn:
+            conn.execute(delete(Tag).where(Tag.id == tag_id))
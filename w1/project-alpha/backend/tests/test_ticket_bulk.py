@@ -0,0 +1,23 @@
+"""Bulk ticket endpoints."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+@pytest.fixture
+def client(database):
+    return TestClient(app)
+
+
+def test_bulk_delete_reports_duplicates_once(client, seeded_tickets):
+    _, ticket_ids = seeded_tickets
+    first, second = ticket_ids[:2]
+    missing = max(ticket_ids) + 1_000_000
+    response = client.post("/api/tickets/bulk/delete", json={"ids": [first, second, first, missing]})
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["status"] for item in body["items"]] == ["deleted", "deleted", "invalid", "not_found"]
+    assert body["succeeded"] == 2
+    assert body["failed"] == 2
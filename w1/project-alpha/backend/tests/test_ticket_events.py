@@ -0,0 +1,40 @@
+"""Postgres LISTEN/NOTIFY change feed."""
+
+import logging
+import threading
+
+from sqlalchemy import func, select
+
+from app.services import ticket_events
+
+PAYLOADS = ("not json", '["list"]', '{"foo": 1}', '{"type": "updated", "id": 42}')
+
+
+def test_listener_skips_malformed_payloads(database, caplog):
+    received = []
+    delivered = threading.Event()
+
+    def collect(events):
+        received.extend(events)
+        if any(e.id == 42 for e in events):
+            delivered.set()
+
+    ticket_events.broker.add_listener(collect)
+    listener = ticket_events.PgListener(database, poll_timeout=0.2)
+    listener.start()
+    try:
+        with caplog.at_level(logging.WARNING, logger=ticket_events.__name__):
+            # LISTEN 生效前发出的通知会丢失，重发直到收到为止
+            for _ in range(25):
+                with database.begin() as conn:
+                    for payload in PAYLOADS:
+                        conn.execute(select(func.pg_notify(ticket_events.CHANNEL, payload)))
+                if delivered.wait(0.2):
+                    break
+        assert delivered.is_set()
+        assert {e for e in received if e.id == 42} == {ticket_events.TicketEvent("updated", 42)}
+        assert "ignoring malformed ticket event" in caplog.text
+        assert "reconnecting" not in caplog.text
+    finally:
+        listener.stop()
+        ticket_events.broker._listeners.remove(collect)
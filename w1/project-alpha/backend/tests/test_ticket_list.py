@@ -0,0 +1,36 @@
+"""Pagination behaviour of GET /api/tickets."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+@pytest.fixture
+def client(database):
+    return TestClient(app)
+
+
+def test_title_search_pages_by_cursor(client, seeded_tickets):
+    prefix, ticket_ids = seeded_tickets
+    seen = []
+    params = {"search": prefix, "limit": 25, "include_total": "false"}
+    while True:
+        body = client.get("/api/tickets", params=params).json()
+        seen += [item["id"] for item in body["items"]]
+        if not body["next_cursor"]:
+            break
+        params["cursor"] = body["next_cursor"]
+    assert sorted(seen) == sorted(ticket_ids)
+
+
+def test_fulltext_search_returns_no_cursor(client, seeded_tickets):
+    prefix, _ = seeded_tickets
+    response = client.get(
+        "/api/tickets", params={"search": prefix, "search_mode": "fulltext", "limit": 10}
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body["items"]) == 10
+    assert body["total"] == 60
+    assert body["next_cursor"] is None
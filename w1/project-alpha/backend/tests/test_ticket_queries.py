@@ -0,0 +1,124 @@
+"""Ticket reads must cost a fixed number of statements, whatever the page size."""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.main import app
+from app.models import Tag
+from app.schemas.ticket import TicketOut
+from app.services import tag_cache, ticket_service
+
+LIMITS = (1, 10, 50)
+
+
+@pytest.fixture
+def client(database):
+    # 不进入 lifespan：不启动 LISTEN 线程，只测请求本身发出的语句
+    return TestClient(app)
+
+
+def _statements_per_limit(counter, fetch):
+    fetch(max(LIMITS))  # 预热标签缓存
+    counts = {}
+    for limit in LIMITS:
+        counter.count = 0
+        fetch(limit)
+        counts[limit] = counter.count
+    return counts
+
+
+def test_list_endpoint_statement_count(client, seeded_tickets, count_statements):
+    prefix, _ = seeded_tickets
+
+    def fetch(limit):
+        response = client.get("/api/tickets", params={"search": prefix, "limit": limit})
+        assert response.status_code == 200
+        items = response.json()["items"]
+        assert len(items) == limit
+        assert all(len(item["tags"]) == 2 for item in items)
+
+    counts = _statements_per_limit(count_statements, fetch)
+    assert len(set(counts.values())) == 1, counts
+    assert counts[LIMITS[0]] <= 2
+
+
+@pytest.mark.parametrize("include_total", [True, False])
+def test_list_service_statement_count(db, seeded_tickets, count_statements, include_total):
+    prefix, _ = seeded_tickets
+
+    def fetch(limit):
+        page = ticket_service.list_tickets(
+            db, search=prefix, limit=limit, include_total=include_total
+        )
+        # 序列化时访问 tags 不能再触发懒加载
+        out = [TicketOut.model_validate(ticket) for ticket in page.items]
+        assert len(out) == limit
+        assert all(len(ticket.tags) == 2 for ticket in out)
+        db.expunge_all()
+
+    counts = _statements_per_limit(count_statements, fetch)
+    assert len(set(counts.values())) == 1, counts
+    # 列表一条（含窗口计数）+ 标签一条 IN 查询
+    assert counts[LIMITS[0]] == 2
+
+
+def test_detail_endpoint_statement_count(client, seeded_tickets, count_statements):
+    _, ticket_ids = seeded_tickets
+    client.get(f"/api/tickets/{ticket_ids[1]}")  # 预热标签缓存
+    count_statements.count = 0
+    response = client.get(f"/api/tickets/{ticket_ids[0]}")
+    assert response.status_code == 200
+    assert len(response.json()["tags"]) == 2
+    assert count_statements.count == 2
+
+
+@pytest.mark.parametrize("use_cursor", [False, True])
+def test_list_without_window_total_skips_fingerprint(client, seeded_tickets, count_statements, use_cursor):
+    prefix, _ = seeded_tickets
+    params = {"search": prefix, "limit": 10, "include_total": "false"}
+    if use_cursor:
+        params["cursor"] = client.get("/api/tickets", params=params).json()["next_cursor"]
+    client.get("/api/tickets", params=params)  # 预热标签缓存
+
+    count_statements.count = 0
+    response = client.get("/api/tickets", params=params)
+    assert response.status_code == 200
+    # 无 If-None-Match 时只查本页，不做 max(updated_at)/count(*) 聚合
+    assert count_statements.count == 1
+
+    # 用普通 GET 拿到的 ETag 校验：重跑本页查询，数据未变则 304
+    count_statements.count = 0
+    response = client.get("/api/tickets", params=params, headers={"If-None-Match": response.headers["ETag"]})
+    assert response.status_code == 304
+    assert count_statements.count == 1
+
+
+@pytest.mark.parametrize("offset", [0, 1000])
+def test_list_with_window_total_revalidates_by_fingerprint(client, seeded_tickets, count_statements, offset):
+    prefix, _ = seeded_tickets
+    params = {"search": prefix, "limit": 10, "offset": offset}
+    etag = client.get("/api/tickets", params=params).headers["ETag"]
+
+    count_statements.count = 0
+    response = client.get("/api/tickets", params=params, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    # 只做一次聚合校验，不查列表
+    assert count_statements.count == 1
+
+
+def test_tag_rename_changes_list_etag(client, db, seeded_tickets):
+    prefix, _ = seeded_tickets
+    params = {"search": prefix, "limit": 10}
+    etag = client.get("/api/tickets", params=params).headers["ETag"]
+
+    # 改标签名不会更新 ticket.updated_at
+    tag = db.scalars(select(Tag).where(Tag.name == f"{prefix}-a")).one()
+    tag.name = f"{prefix}-renamed"
+    db.commit()
+    tag_cache.cache.invalidate()
+
+    response = client.get("/api/tickets", params=params, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert f"{prefix}-renamed" in {t["name"] for t in response.json()["items"][0]["tags"]}
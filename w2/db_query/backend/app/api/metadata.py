@@ -1,27 +1,69 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from pydantic_core import to_json
 from sqlalchemy.orm import Session
-import json
 
 from app.db.session import get_db
-from app.services import metadata_service
-from app.models.connection import ConnectionCreate, ConnectionOut, MetadataResponse, TableInfo, ConnectionUpdate
+from app.services import catalog_search, metadata_service
+from app.services.sync_worker import SyncState, sync_worker
+from app.models.connection import (
+    CatalogSearchResponse,
+    ConnectionCreate,
+    ConnectionOut,
+    ConnectionUpdate,
+    MetadataResponse,
+    SyncStatus,
+)
 from app.models.schemas import ErrorResponse
 
 router = APIRouter(prefix="/metadata", tags=["metadata"])
 
 
+def _sync_status(state: SyncState) -> SyncStatus:
+    return SyncStatus(
+        connection_id=state.connection_id,
+        status=state.status,
+        queued_at=state.queued_at,
+        started_at=state.started_at,
+        finished_at=state.finished_at,
+        error=state.error,
+        changes=state.changes,
+    )
+
+
+def _metadata_response(db: Session, conn, tables, state: SyncState) -> Response:
+    # 表多时逐个构造/校验 pydantic 模型很慢：数据来自本地存储，直接序列化成 MetadataResponse 的结构
+    connection = ConnectionOut(
+        id=conn.id,
+        name=conn.name,
+        connectionUrl=conn.connection_url,  # alias
+        lastSynced=conn.last_synced,
+    )
+    payload = {
+        "connection": connection.model_dump(by_alias=True),
+        "tables": metadata_service.export_table_dicts(db, conn.id, tables),
+        "stale": metadata_service.is_stale(conn),
+        "sync": _sync_status(state).model_dump(by_alias=True),
+    }
+    return Response(to_json(payload), media_type="application/json")
+
+
 @router.post("/sync", response_model=MetadataResponse, responses={400: {"model": ErrorResponse}})
 def sync_metadata(payload: ConnectionCreate, db: Session = Depends(get_db)):
-    conn, tables = metadata_service.sync_metadata(db, payload.connection_url, payload.name)
-    return MetadataResponse(
-        connection=ConnectionOut(
-            id=conn.id,
-            name=conn.name,
-            connectionUrl=conn.connection_url,  # alias
-            lastSynced=conn.last_synced,
-        ),
-        tables=tables,
-    )
+    """
+    Register the connection and return its cached metadata right away.
+
+    Introspection runs in the background: it is queued when `refresh` is set
+    or the cached metadata is stale; poll GET /metadata/{id}/sync for progress.
+    """
+    conn = metadata_service.register_connection(db, payload.connection_url, payload.name)
+    if payload.refresh or metadata_service.is_stale(conn):
+        state = sync_worker.enqueue(conn.id)
+    else:
+        state = sync_worker.status(conn.id)
+    conn, tables = metadata_service.get_metadata(db, conn.id)
+    return _metadata_response(db, conn, tables, state)
 
 
 @router.get("", response_model=list[ConnectionOut])
@@ -44,19 +86,42 @@ def get_connection_metadata(connection_id: int, db: Session = Depends(get_db)):
     if not result:
         raise HTTPException(status_code=404, detail="Connection not found")
     conn, tables = result
-    parsed_tables = []
-    for t in tables:
-        cols = json.loads(t.columns_json)
-        parsed_tables.append(TableInfo(schema=t.schema, name=t.name, is_view=t.is_view, columns=cols))
-    return MetadataResponse(
-        connection=ConnectionOut(
-            id=conn.id,
-            name=conn.name,
-            connectionUrl=conn.connection_url,
-            lastSynced=conn.last_synced,
-        ),
-        tables=parsed_tables,
+    return _metadata_response(db, conn, tables, sync_worker.status(conn.id))
+
+
+@router.get("/{connection_id}/sync", response_model=SyncStatus, responses={404: {"model": ErrorResponse}})
+def get_sync_status(connection_id: int, db: Session = Depends(get_db)):
+    if not metadata_service.get_connection(db, connection_id):
+        raise HTTPException(status_code=404, detail="Connection not found")
+    return _sync_status(sync_worker.status(connection_id))
+
+
+@router.post(
+    "/{connection_id}/sync", status_code=202, response_model=SyncStatus, responses={404: {"model": ErrorResponse}}
+)
+def refresh_connection_metadata(connection_id: int, db: Session = Depends(get_db)):
+    if not metadata_service.get_connection(db, connection_id):
+        raise HTTPException(status_code=404, detail="Connection not found")
+    return _sync_status(sync_worker.enqueue(connection_id))
+
+
+@router.get("/{connection_id}/search", response_model=CatalogSearchResponse, responses={404: {"model": ErrorResponse}})
+def search_catalog(
+    connection_id: int,
+    q: str = Query(..., min_length=1, max_length=200),
+    kind: Literal["all", "table", "column"] = "all",
+    fuzzy: bool = True,
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+):
+    """Search table and column names of a synced connection (substring, prefix and fuzzy), paginated."""
+    if not metadata_service.get_connection(db, connection_id):
+        raise HTTPException(status_code=404, detail="Connection not found")
+    total, truncated, items = catalog_search.search(
+        db, connection_id, q, kind=kind, fuzzy=fuzzy, limit=limit, offset=offset
     )
+    return CatalogSearchResponse(query=q, total=total, truncated=truncated, limit=limit, offset=offset, items=items)
 
 
 @router.put("/{connection_id}", response_model=ConnectionOut, responses={404: {"model": ErrorResponse}})
@@ -0,0 +1,23 @@
+from fastapi import APIRouter
+
+from app.db.manager import manager
+from app.models.metrics import ConnectionPoolMetrics, QueryCacheMetrics, SqlGuardMetrics
+from app.services import sql_guard
+from app.services.result_cache import cache
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("/connections", response_model=ConnectionPoolMetrics)
+def connection_metrics():
+    return ConnectionPoolMetrics(**manager.stats())
+
+
+@router.get("/query-cache", response_model=QueryCacheMetrics)
+def query_cache_metrics():
+    return QueryCacheMetrics(**cache.stats())
+
+
+@router.get("/sql-guard", response_model=SqlGuardMetrics)
+def sql_guard_metrics():
+    return SqlGuardMetrics(**sql_guard.stats())
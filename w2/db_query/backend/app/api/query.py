@@ -1,20 +1,128 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
+from app.db.manager import ConnectionLimitError
 from app.db.session import get_db
-from app.models.query import QueryRequest, QueryResult
+from app.models.query import CacheInvalidateResponse, QueryJobStatus, QueryRequest, QueryResult
 from app.models.schemas import ErrorResponse
 from app.services import query_service
+from app.services.arrow_format import ARROW_MEDIA_TYPE
+from app.services.query_jobs import SUCCEEDED, JobNotFoundError, QueryJob, jobs
+from app.services.sql_guard import SqlValidationError
 
 router = APIRouter(prefix="/query", tags=["query"])
 
 
-@router.post("", response_model=QueryResult, responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}})
-def run_query(payload: QueryRequest, db: Session = Depends(get_db)):
+@router.post(
+    "",
+    response_model=QueryResult,
+    responses={
+        200: {"content": {ARROW_MEDIA_TYPE: {}}, "description": "JSON, or an Arrow IPC stream when requested via Accept"},
+        400: {"model": ErrorResponse},
+        404: {"model": ErrorResponse},
+        503: {"model": ErrorResponse},
+    },
+)
+def run_query(payload: QueryRequest, db: Session = Depends(get_db), accept: Optional[str] = Header(None)):
     try:
+        if accept and ARROW_MEDIA_TYPE in accept:
+            return StreamingResponse(query_service.stream_arrow(db, payload), media_type=ARROW_MEDIA_TYPE)
         return query_service.run_query(db, payload)
+    except ConnectionLimitError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/stream", responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}, 503: {"model": ErrorResponse}})
+def stream_query(payload: QueryRequest, db: Session = Depends(get_db)):
+    """Stream rows as NDJSON: a header line with columns, one JSON array per row, then a trailer."""
+    try:
+        lines = query_service.stream_query(db, payload)
+    except ConnectionLimitError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except SqlValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+
+@router.delete("/cache", response_model=CacheInvalidateResponse)
+def invalidate_all_cached_results():
+    return CacheInvalidateResponse(invalidated=query_service.invalidate_cache())
+
+
+@router.delete("/cache/{connection_id}", response_model=CacheInvalidateResponse)
+def invalidate_cached_results(connection_id: int):
+    return CacheInvalidateResponse(invalidated=query_service.invalidate_cache(connection_id))
+
+
+def _job_status(job: QueryJob) -> QueryJobStatus:
+    return QueryJobStatus(
+        job_id=job.id,
+        connection_id=job.connection_id,
+        status=job.status,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        error=job.error,
+    )
+
+
+@router.post(
+    "/jobs",
+    status_code=202,
+    response_model=QueryJobStatus,
+    responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}},
+)
+def submit_query_job(payload: QueryRequest, db: Session = Depends(get_db)):
+    """Queue a query in the background; poll /query/jobs/{id} and fetch /query/jobs/{id}/result."""
+    try:
+        return _job_status(jobs.submit(db, payload))
+    except SqlValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.get("/jobs/{job_id}", response_model=QueryJobStatus, responses={404: {"model": ErrorResponse}})
+def get_query_job(job_id: str):
+    try:
+        return _job_status(jobs.get(job_id))
+    except JobNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.get(
+    "/jobs/{job_id}/result",
+    response_model=QueryResult,
+    responses={404: {"model": ErrorResponse}, 409: {"model": ErrorResponse}},
+)
+def get_query_job_result(job_id: str):
+    try:
+        job = jobs.get(job_id)
+    except JobNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    if job.status != SUCCEEDED:
+        raise HTTPException(status_code=409, detail=job.error or f"Job is {job.status}")
+    return job.result
+
 
+@router.post(
+    "/jobs/{job_id}/cancel",
+    response_model=QueryJobStatus,
+    responses={404: {"model": ErrorResponse}, 503: {"model": ErrorResponse}},
+)
+def cancel_query_job(job_id: str):
+    try:
+        return _job_status(jobs.cancel(job_id))
+    except JobNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
@@ -11,6 +11,31 @@ class Settings(BaseModel):
     api_host: str = os.getenv("API_HOST", "127.0.0.1")
     api_port: int = int(os.getenv("API_PORT", "8000"))
     cors_origins: list[str] = ["*"]
+    # 目标数据库连接池（每个已保存连接一个池）
+    target_pool_size: int = int(os.getenv("TARGET_POOL_SIZE", "2"))
+    target_max_overflow: int = int(os.getenv("TARGET_MAX_OVERFLOW", "3"))
+    target_pool_timeout: float = float(os.getenv("TARGET_POOL_TIMEOUT", "30"))
+    target_pool_recycle: int = int(os.getenv("TARGET_POOL_RECYCLE", "1800"))
+    target_idle_timeout: float = float(os.getenv("TARGET_IDLE_TIMEOUT", "600"))
+    target_max_connections: int = int(os.getenv("TARGET_MAX_CONNECTIONS", "50"))
+    # 流式查询：每批从服务端游标取的行数；是否允许不加 LIMIT
+    query_stream_batch_rows: int = int(os.getenv("QUERY_STREAM_BATCH_ROWS", "500"))
+    query_stream_allow_unlimited: bool = os.getenv("QUERY_STREAM_ALLOW_UNLIMITED", "false").lower() == "true"
+    # 查询结果缓存（请求中 useCache=true 时生效）：有效期秒数与总字节上限，任一为 0 即关闭
+    query_cache_ttl: float = float(os.getenv("QUERY_CACHE_TTL", "60"))
+    query_cache_max_bytes: int = int(os.getenv("QUERY_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    # SQL 校验结果的 LRU 条目数
+    sql_guard_cache_size: int = int(os.getenv("SQL_GUARD_CACHE_SIZE", "1024"))
+    # 后台查询任务：工作线程数、每个连接同时运行的任务数、语句超时（毫秒）、完成后保留秒数
+    query_job_workers: int = int(os.getenv("QUERY_JOB_WORKERS", "4"))
+    query_job_max_per_connection: int = int(os.getenv("QUERY_JOB_MAX_PER_CONNECTION", "2"))
+    query_statement_timeout_ms: int = int(os.getenv("QUERY_STATEMENT_TIMEOUT_MS", "300000"))
+    query_job_retention: float = float(os.getenv("QUERY_JOB_RETENTION", "600"))
+    # 元数据同步时并行抓取的 schema 数，1 表示一条查询取全部
+    metadata_sync_parallelism: int = int(os.getenv("METADATA_SYNC_PARALLELISM", "1"))
+    # 后台元数据同步：工作线程数；定时刷新间隔秒数（超过即视为过期，0 表示不定时刷新）
+    metadata_sync_workers: int = int(os.getenv("METADATA_SYNC_WORKERS", "1"))
+    metadata_refresh_interval: float = float(os.getenv("METADATA_REFRESH_INTERVAL", "3600"))
 
 
 @lru_cache
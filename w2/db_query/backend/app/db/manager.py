@@ -0,0 +1,186 @@
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Connection as DbConnection, Engine
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import get_settings
+
+
+class ConnectionLimitError(RuntimeError):
+    """Raised when the total connection cap across all target databases is reached."""
+
+
+@dataclass
+class _Entry:
+    url: str
+    engine: Engine
+    last_used: float = field(default_factory=time.monotonic)
+    # 通过 connect() 借出或已预留、尚未归还的连接数；大于 0 时连接池不会被回收
+    active: int = 0
+    # 已从 _entries 移除、等最后一个使用者归还后再关闭
+    retired: bool = False
+
+
+class ConnectionManager:
+    """Pooled engines for target databases, keyed by `Connection.id`.
+
+    Each saved connection gets one bounded `QueuePool`, created on first use
+    and reused by query, NL2SQL and metadata sync. Engines idle longer than
+    `idle_timeout` are disposed on the next access, and the number of open
+    connections across all pools is capped at `max_total`: when the cap is
+    hit, idle pools are closed least recently used first before giving up.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 2,
+        max_overflow: int = 3,
+        pool_timeout: float = 30,
+        pool_recycle: int = 1800,
+        idle_timeout: float = 600,
+        max_total: int = 50,
+    ) -> None:
+        self._pool_options = {
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_timeout": pool_timeout,
+            "pool_recycle": pool_recycle,
+        }
+        self._idle_timeout = idle_timeout
+        self._max_total = max_total
+        self._entries: Dict[int, _Entry] = {}
+        # 被作废但仍有使用者的连接池，照常计入 max_total
+        self._retired: List[_Entry] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connect(self, connection_id: int, connection_url: str) -> Iterator[DbConnection]:
+        """Check out a connection, enforcing the total connection cap.
+
+        The slot is reserved under the lock before the checkout, so
+        concurrent callers cannot overshoot `max_total`, and the pool stays
+        pinned (never evicted) until the connection is returned.
+        """
+        with self._lock:
+            entry = self._reserve(connection_id, connection_url)
+        try:
+            with entry.engine.connect() as connection:
+                yield connection
+        finally:
+            with self._lock:
+                entry.active -= 1
+                entry.last_used = time.monotonic()
+                if entry.retired and entry.active == 0:
+                    self._retired.remove(entry)
+                    entry.engine.dispose()
+
+    def dispose(self, connection_id: int) -> None:
+        """Close the pool of a connection; call when it is renamed, changed or deleted."""
+        with self._lock:
+            self._dispose_entry(connection_id)
+
+    def close_all(self) -> None:
+        with self._lock:
+            for connection_id in list(self._entries):
+                self._dispose_entry(connection_id)
+
+    def stats(self) -> dict:
+        with self._lock:
+            now = time.monotonic()
+            pools = [
+                {
+                    "connection_id": connection_id,
+                    "checked_out": entry.engine.pool.checkedout(),
+                    "checked_in": entry.engine.pool.checkedin(),
+                    "idle_seconds": round(now - entry.last_used, 1),
+                }
+                for connection_id, entry in self._entries.items()
+            ]
+            return {
+                "open_connections": self._open_connections(),
+                "max_connections": self._max_total,
+                "pools": pools,
+            }
+
+    def _reserve(self, connection_id: int, connection_url: str) -> _Entry:
+        # 调用方持有锁
+        self._evict_idle()
+        entry = self._entries.get(connection_id)
+        if entry is not None and entry.url != connection_url:
+            # 同一 id 的连接串变了：旧连接池作废，最后一个使用者归还后关闭
+            self._dispose_entry(connection_id)
+            entry = None
+        if entry is None:
+            entry = _Entry(url=connection_url, engine=self._create_engine(connection_url))
+            self._entries[connection_id] = entry
+        entry.active += 1
+        entry.last_used = time.monotonic()
+        if self._open_connections() > self._max_total:
+            self._evict_lru()
+            if self._open_connections() > self._max_total:
+                entry.active -= 1
+                raise ConnectionLimitError(
+                    f"Too many open database connections (limit {self._max_total}), try again later"
+                )
+        return entry
+
+    def _create_engine(self, connection_url: str) -> Engine:
+        return create_engine(
+            connection_url,
+            poolclass=QueuePool,
+            pool_pre_ping=True,
+            **self._pool_options,
+        )
+
+    def _open_connections(self) -> int:
+        # 已预留但还没借到连接的请求会先用池里的空闲连接，不够时才新建
+        return sum(
+            max(entry.engine.pool.checkedout() + entry.engine.pool.checkedin(), entry.active)
+            for entry in [*self._entries.values(), *self._retired]
+        )
+
+    def _dispose_entry(self, connection_id: int) -> None:
+        entry = self._entries.pop(connection_id, None)
+        if entry is None:
+            return
+        if entry.active:
+            # dispose() 会换上新池，已预留但还没借到连接的调用方会落到不受管理的池上
+            entry.retired = True
+            self._retired.append(entry)
+        else:
+            entry.engine.dispose()
+
+    def _evict_idle(self) -> None:
+        deadline = time.monotonic() - self._idle_timeout
+        for connection_id, entry in list(self._entries.items()):
+            if entry.last_used < deadline and entry.active == 0:
+                self._dispose_entry(connection_id)
+
+    def _evict_lru(self) -> None:
+        # 只关闭没有借出或预留连接的连接池，正在执行的查询不受影响
+        by_age = sorted(self._entries.items(), key=lambda item: item[1].last_used)
+        for connection_id, entry in by_age:
+            if self._open_connections() <= self._max_total:
+                return
+            if entry.active == 0:
+                self._dispose_entry(connection_id)
+
+
+def _build_manager() -> ConnectionManager:
+    settings = get_settings()
+    return ConnectionManager(
+        pool_size=settings.target_pool_size,
+        max_overflow=settings.target_max_overflow,
+        pool_timeout=settings.target_pool_timeout,
+        pool_recycle=settings.target_pool_recycle,
+        idle_timeout=settings.target_idle_timeout,
+        max_total=settings.target_max_connections,
+    )
+
+
+manager = _build_manager()
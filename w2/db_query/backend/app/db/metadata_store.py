@@ -1,8 +1,15 @@
+import json
+import threading
 from datetime import datetime
-from typing import List, Tuple
+from itertools import groupby
+from operator import itemgetter
+from typing import Any, Dict, List, Tuple
 
 import os
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Boolean, Text, create_engine, select, delete
+from sqlalchemy import (
+    Column, DateTime, ForeignKey, Index, Integer, String, Boolean, Text, create_engine, select, delete, insert, update, text,
+)
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import declarative_base, relationship, sessionmaker, Session
 
 from app.core.config import get_settings
@@ -37,13 +44,125 @@ class TableMetadata(Base):
     schema = Column(String, nullable=False)
     name = Column(String, nullable=False)
     is_view = Column(Boolean, default=False)
-    columns_json = Column(Text, nullable=False)  # store columns as JSON string
+    constraints_json = Column(Text, nullable=True)  # {"primary_key": [...], "foreign_keys": [...]}
+    row_estimate = Column(Integer, nullable=True)
+    fingerprint = Column(String, nullable=True)  # hash of the stored fields, used by incremental sync
 
     connection = relationship("Connection", back_populates="tables")
 
+    __table_args__ = (Index("ix_table_metadata_conn_schema_name", "connection_id", "schema", "name"),)
+
+
+class ColumnMetadata(Base):
+    __tablename__ = "column_metadata"
+    id = Column(Integer, primary_key=True)
+    connection_id = Column(Integer, ForeignKey("connections.id", ondelete="CASCADE"), nullable=False)
+    table_id = Column(Integer, ForeignKey("table_metadata.id", ondelete="CASCADE"), nullable=False)
+    position = Column(Integer, nullable=False)
+    name = Column(String, nullable=False)
+    data_type = Column(String, nullable=False)
+
+    __table_args__ = (
+        # 按连接读取全部列时走这个索引，顺序即 (表, 列序号)
+        Index("ix_column_metadata_conn_table", "connection_id", "table_id", "position"),
+        Index("ix_column_metadata_name", "name"),
+    )
+
+
+# SQLite 单条语句的绑定参数上限较低，批量删除时分块
+_DELETE_CHUNK = 500
+_initialized = False
+# 请求线程与同步线程都会调用 init_db，迁移 DDL 只能执行一次
+_init_lock = threading.Lock()
+# 在初版表结构之后新增的列
+_ADDED_COLUMNS = {"constraints_json": "TEXT", "row_estimate": "INTEGER", "fingerprint": "VARCHAR"}
+
+
+def _migrate():
+    # create_all 不会给已存在的表加列/索引，旧库在这里补齐
+    with engine.begin() as conn:
+        columns = {row[1] for row in conn.execute(text("PRAGMA table_info(table_metadata)"))}
+        for name, ddl in _ADDED_COLUMNS.items():
+            if name not in columns:
+                conn.execute(text(f"ALTER TABLE table_metadata ADD COLUMN {name} {ddl}"))
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_table_metadata_conn_schema_name "
+                "ON table_metadata (connection_id, schema, name)"
+            )
+        )
+        if "columns_json" in columns:
+            _backfill_columns(conn)
+        _setup_search(conn)
+
+
+def _backfill_columns(conn):
+    # 旧版把列存成 columns_json；拆到 column_metadata 后删除该列（需要 SQLite >= 3.35）
+    rows = conn.execute(text("SELECT id, connection_id, columns_json FROM table_metadata")).all()
+    column_rows = [
+        {"connection_id": connection_id, "table_id": table_id, "position": position, "name": c["name"], "data_type": c["data_type"]}
+        for table_id, connection_id, columns_json in rows
+        for position, c in enumerate(json.loads(columns_json or "[]"))
+    ]
+    conn.execute(delete(ColumnMetadata))
+    if column_rows:
+        conn.execute(insert(ColumnMetadata), column_rows)
+    conn.execute(text("ALTER TABLE table_metadata DROP COLUMN columns_json"))
+
+
+# 表名/列名的全文索引：trigram 分词支持任意子串匹配（>= 3 个字符），内容直接引用元数据表，由触发器维护
+_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS table_fts USING fts5(name, content='table_metadata', content_rowid='id', tokenize='trigram')",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS column_fts USING fts5(name, content='column_metadata', content_rowid='id', tokenize='trigram')",
+    """CREATE TRIGGER IF NOT EXISTS table_metadata_fts_ai AFTER INSERT ON table_metadata BEGIN
+        INSERT INTO table_fts(rowid, name) VALUES (new.id, new.name);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS table_metadata_fts_ad AFTER DELETE ON table_metadata BEGIN
+        INSERT INTO table_fts(table_fts, rowid, name) VALUES ('delete', old.id, old.name);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS table_metadata_fts_au AFTER UPDATE OF name ON table_metadata BEGIN
+        INSERT INTO table_fts(table_fts, rowid, name) VALUES ('delete', old.id, old.name);
+        INSERT INTO table_fts(rowid, name) VALUES (new.id, new.name);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS column_metadata_fts_ai AFTER INSERT ON column_metadata BEGIN
+        INSERT INTO column_fts(rowid, name) VALUES (new.id, new.name);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS column_metadata_fts_ad AFTER DELETE ON column_metadata BEGIN
+        INSERT INTO column_fts(column_fts, rowid, name) VALUES ('delete', old.id, old.name);
+    END""",
+    "INSERT INTO table_fts(table_fts) VALUES ('rebuild')",
+    "INSERT INTO column_fts(column_fts) VALUES ('rebuild')",
+]
+# SQLite 未编译 FTS5 / trigram（< 3.34）时为 False，搜索退回 LIKE 扫描
+fts_enabled = False
+
+
+def _setup_search(conn):
+    global fts_enabled
+    if conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'column_fts'")).first():
+        fts_enabled = True
+        return
+    try:
+        # 第一条 DDL 兼作探测：SQLite 未编译 FTS5 或不支持 trigram 时在这里报错
+        conn.execute(text(_SEARCH_DDL[0]))
+    except OperationalError:
+        fts_enabled = False
+        return
+    for ddl in _SEARCH_DDL[1:]:
+        conn.execute(text(ddl))
+    fts_enabled = True
+
 
 def init_db():
-    Base.metadata.create_all(bind=engine)
+    global _initialized
+    if _initialized:
+        return
+    with _init_lock:
+        if _initialized:
+            return
+        Base.metadata.create_all(bind=engine)
+        _migrate()
+        _initialized = True
 
 
 def upsert_connection(db: Session, connection_url: str, name: str | None = None) -> Connection:
@@ -57,12 +176,126 @@ def upsert_connection(db: Session, connection_url: str, name: str | None = None)
     return conn
 
 
-def replace_metadata(db: Session, connection_id: int, tables: List[Tuple[str, str, bool, str]]):
-    # tables: list of (schema, name, is_view, columns_json)
-    db.execute(delete(TableMetadata).where(TableMetadata.connection_id == connection_id))
-    for schema, name, is_view, columns_json in tables:
-        db.add(TableMetadata(connection_id=connection_id, schema=schema, name=name, is_view=is_view, columns_json=columns_json))
+def _column_rows(connection_id: int, table_id: int, columns: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+    return [
+        {"connection_id": connection_id, "table_id": table_id, "position": position, "name": name, "data_type": data_type}
+        for position, (name, data_type) in enumerate(columns)
+    ]
+
+
+def _delete_columns(db: Session, table_ids: List[int]) -> None:
+    # SQLite 默认不启用外键，ON DELETE CASCADE 不生效，需要显式删除
+    for i in range(0, len(table_ids), _DELETE_CHUNK):
+        db.execute(delete(ColumnMetadata).where(ColumnMetadata.table_id.in_(table_ids[i : i + _DELETE_CHUNK])))
+
+
+def sync_table_metadata(db: Session, connection_id: int, tables: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Bring stored tables in line with `tables`, touching only what changed.
+
+    Each item holds the TableMetadata values (schema, name, is_view,
+    constraints_json, row_estimate, fingerprint) plus `columns`, a list of
+    (name, data_type) stored as ColumnMetadata rows. Tables whose fingerprint
+    matches are left alone; the rest are inserted, updated or deleted with
+    bulk statements in a single transaction. Returns per-action counts.
+    """
+    existing = {
+        (schema, name): (table_id, fingerprint)
+        for table_id, schema, name, fingerprint in db.execute(
+            select(TableMetadata.id, TableMetadata.schema, TableMetadata.name, TableMetadata.fingerprint).where(
+                TableMetadata.connection_id == connection_id
+            )
+        )
+    }
+
+    inserts, updates, new_columns, changed_columns = [], [], [], []
+    for item in tables:
+        values = {k: v for k, v in item.items() if k != "columns"}
+        current = existing.pop((item["schema"], item["name"]), None)
+        if current is None:
+            inserts.append({"connection_id": connection_id, **values})
+            new_columns.append(item["columns"])
+        elif current[1] != item["fingerprint"]:
+            updates.append({"id": current[0], **values})
+            changed_columns.extend(_column_rows(connection_id, current[0], item["columns"]))
+    # 剩下的是目标库里已不存在的表
+    stale_ids = [table_id for table_id, _ in existing.values()]
+
+    column_rows = changed_columns
+    if inserts:
+        new_ids = db.scalars(
+            insert(TableMetadata).returning(TableMetadata.id, sort_by_parameter_order=True), inserts
+        ).all()
+        for table_id, columns in zip(new_ids, new_columns):
+            column_rows.extend(_column_rows(connection_id, table_id, columns))
+    if updates:
+        db.execute(update(TableMetadata), updates)
+    _delete_columns(db, [row["id"] for row in updates] + stale_ids)
+    for i in range(0, len(stale_ids), _DELETE_CHUNK):
+        db.execute(delete(TableMetadata).where(TableMetadata.id.in_(stale_ids[i : i + _DELETE_CHUNK])))
+    if column_rows:
+        db.execute(insert(ColumnMetadata), column_rows)
     db.commit()
+    return {
+        "inserted": len(inserts),
+        "updated": len(updates),
+        "deleted": len(stale_ids),
+        "unchanged": len(tables) - len(inserts) - len(updates),
+    }
+
+
+def get_columns(db: Session, connection_id: int) -> Dict[int, List[Tuple[str, str]]]:
+    """(name, data_type) of every stored column of a connection, grouped by table id in column order."""
+    # 一个连接可能有几十万列，直接用 DBAPI 游标取元组，省掉 Row 对象的开销
+    rows = db.connection().exec_driver_sql(
+        "SELECT table_id, name, data_type FROM column_metadata WHERE connection_id = ? ORDER BY table_id, position",
+        (connection_id,),
+    )
+    return {
+        table_id: [(name, data_type) for _, name, data_type in group]
+        for table_id, group in groupby(rows.cursor.fetchall(), key=itemgetter(0))
+    }
+
+
+_SEARCH_SQL = {
+    "table": """
+        SELECT 'table', t.schema, t.name, t.is_view, NULL, NULL
+        FROM {source}
+        WHERE t.connection_id = :connection_id AND {condition}
+        {order}
+        LIMIT :limit
+    """,
+    "column": """
+        SELECT 'column', t.schema, t.name, t.is_view, c.name, c.data_type
+        FROM {source}
+        JOIN table_metadata t ON t.id = c.table_id
+        WHERE c.connection_id = :connection_id AND {condition}
+        {order}
+        LIMIT :limit
+    """,
+}
+# (kind, 是否用全文索引) -> (FROM, 匹配条件, 排序)
+_SEARCH_SOURCES = {
+    ("table", True): ("table_fts JOIN table_metadata t ON t.id = table_fts.rowid", "table_fts MATCH :match", "ORDER BY table_fts.rank"),
+    ("column", True): ("column_fts JOIN column_metadata c ON c.id = column_fts.rowid", "column_fts MATCH :match", "ORDER BY column_fts.rank"),
+    ("table", False): ("table_metadata t", "t.name LIKE :like ESCAPE '\\'", ""),
+    ("column", False): ("column_metadata c", "c.name LIKE :like ESCAPE '\\'", ""),
+}
+
+
+def search_catalog(
+    db: Session, connection_id: int, kind: str, limit: int, match: str | None = None, like: str | None = None
+) -> List[Tuple[str, str, str, bool, str | None, str | None]]:
+    """
+    Candidate tables or columns (`kind`) of a connection whose name matches.
+
+    Pass an FTS5 expression as `match` (best bm25 rank first; needs fts_enabled)
+    or a LIKE pattern as `like`. Rows are (kind, schema, table, is_view, column, data_type).
+    """
+    source, condition, order = _SEARCH_SOURCES[(kind, match is not None)]
+    sql = _SEARCH_SQL[kind].format(source=source, condition=condition, order=order)
+    params = {"connection_id": connection_id, "limit": limit, "match": match, "like": like}
+    return [tuple(row) for row in db.execute(text(sql), params)]
 
 
 def update_last_synced(db: Session, connection_id: int):
@@ -78,6 +311,10 @@ def list_connections(db: Session) -> List[Connection]:
     return db.execute(select(Connection).order_by(Connection.created_at.desc())).scalars().all()
 
 
+def get_connection(db: Session, connection_id: int) -> Connection | None:
+    return db.execute(select(Connection).where(Connection.id == connection_id)).scalar_one_or_none()
+
+
 def get_metadata(db: Session, connection_id: int) -> tuple[Connection, List[TableMetadata]] | None:
     conn = db.execute(select(Connection).where(Connection.id == connection_id)).scalar_one_or_none()
     if not conn:
@@ -1,15 +1,33 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from app.core.config import get_settings
+from app.db import metadata_store
+from app.db.manager import ConnectionLimitError, manager
 from app.models.schemas import HealthResponse, ErrorResponse
+from app.services.query_jobs import jobs
+from app.services.sync_worker import sync_worker
 from app.services.sql_guard import SqlValidationError
 from app.api import api_router
 
 settings = get_settings()
 
-app = FastAPI(title="db_query API")
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    # 先在启动时完成建表与迁移，再启动会并发访问元数据库的同步线程
+    metadata_store.init_db()
+    sync_worker.start()
+    yield
+    sync_worker.stop()
+    jobs.shutdown()
+    manager.close_all()
+
+
+app = FastAPI(title="db_query API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -33,6 +51,14 @@ async def sql_validation_exception_handler(_: Request, exc: SqlValidationError):
     )
 
 
+@app.exception_handler(ConnectionLimitError)
+async def connection_limit_exception_handler(_: Request, exc: ConnectionLimitError):
+    return JSONResponse(
+        status_code=503,
+        content=ErrorResponse(detail=str(exc), code="CONNECTION_LIMIT").model_dump(by_alias=True),
+    )
+
+
 @app.exception_handler(Exception)
 async def generic_exception_handler(_: Request, exc: Exception):
     return JSONResponse(
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel, AnyUrl, Field
 from datetime import datetime
 
@@ -47,14 +47,68 @@ class ColumnInfo(BaseModel):
     data_type: str
 
 
+class ForeignKeyInfo(BaseModel):
+    name: str
+    columns: List[str]
+    ref_schema: str
+    ref_table: str
+    ref_columns: List[str]
+
+
 class TableInfo(BaseModel):
     schema: str
     name: str
     is_view: bool
     columns: List[ColumnInfo]
+    primary_key: List[str] = []
+    foreign_keys: List[ForeignKeyInfo] = []
+    # 来自 pg_class.reltuples 的估算行数；从未 ANALYZE 过时为 None
+    row_estimate: Optional[int] = None
+
+
+class SyncStatus(BaseModel):
+    connection_id: int = Field(..., alias="connectionId")
+    # idle / queued / running / succeeded / failed
+    status: str
+    queued_at: Optional[datetime] = Field(None, alias="queuedAt")
+    started_at: Optional[datetime] = Field(None, alias="startedAt")
+    finished_at: Optional[datetime] = Field(None, alias="finishedAt")
+    error: Optional[str] = None
+    # 上次同步的变更数：inserted / updated / deleted / unchanged
+    changes: Optional[Dict[str, int]] = None
+
+    class Config:
+        populate_by_name = True
 
 
 class MetadataResponse(BaseModel):
     connection: ConnectionOut
     tables: List[TableInfo]
+    # 元数据从未同步或已超过刷新间隔
+    stale: bool = False
+    sync: Optional[SyncStatus] = None
+
+
+class CatalogSearchHit(BaseModel):
+    # table / column
+    kind: str
+    schema: str
+    table: str
+    is_view: bool = Field(False, alias="isView")
+    column: Optional[str] = None
+    data_type: Optional[str] = Field(None, alias="dataType")
+    # 1 为完全匹配，其后依次为前缀、子串、模糊匹配
+    score: float
+
+    class Config:
+        populate_by_name = True
+
 
+class CatalogSearchResponse(BaseModel):
+    query: str
+    total: int
+    # 候选数达到上限，total 只是下限
+    truncated: bool = False
+    limit: int
+    offset: int
+    items: List[CatalogSearchHit]
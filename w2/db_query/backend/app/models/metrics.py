@@ -0,0 +1,37 @@
+from typing import List
+
+from pydantic import BaseModel
+
+
+class PoolStats(BaseModel):
+    connection_id: int
+    checked_out: int
+    checked_in: int
+    idle_seconds: float
+
+
+class ConnectionPoolMetrics(BaseModel):
+    open_connections: int
+    max_connections: int
+    pools: List[PoolStats]
+
+
+class QueryCacheMetrics(BaseModel):
+    entries: int
+    bytes: int
+    max_bytes: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    hit_rate: float
+
+
+class SqlGuardMetrics(BaseModel):
+    cache_size: int
+    cache_max_size: int
+    hits: int
+    misses: int
+    hit_rate: float
+    parses: int
+    parse_ms_avg: float
+    parse_ms_max: float
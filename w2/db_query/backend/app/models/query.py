@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Any, List, Optional
 from pydantic import BaseModel, Field
 
@@ -5,6 +6,10 @@ from pydantic import BaseModel, Field
 class QueryRequest(BaseModel):
     connection_id: int = Field(..., alias="connectionId")
     sql: str
+    # 仅流式输出（/query/stream 或 Arrow）生效，且需服务端开启 QUERY_STREAM_ALLOW_UNLIMITED
+    unlimited: bool = False
+    # 允许返回 TTL 内的缓存结果（仅 JSON 结果）
+    use_cache: bool = Field(False, alias="useCache")
 
     class Config:
         populate_by_name = True
@@ -24,3 +29,20 @@ class QueryResult(BaseModel):
     class Config:
         populate_by_name = True
 
+
+class CacheInvalidateResponse(BaseModel):
+    invalidated: int
+
+
+class QueryJobStatus(BaseModel):
+    job_id: str = Field(..., alias="jobId")
+    connection_id: int = Field(..., alias="connectionId")
+    # queued / running / succeeded / failed / cancelled
+    status: str
+    created_at: datetime = Field(..., alias="createdAt")
+    started_at: Optional[datetime] = Field(None, alias="startedAt")
+    finished_at: Optional[datetime] = Field(None, alias="finishedAt")
+    error: Optional[str] = None
+
+    class Config:
+        populate_by_name = True
@@ -0,0 +1,99 @@
+import json
+from decimal import Decimal
+from typing import Any, Iterable, List, Optional, Sequence
+
+import pyarrow as pa
+
+from app.models.query import QueryColumn
+
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+# Postgres 内置类型 OID -> (类型名, Arrow 类型)；Arrow 类型为 None 时按文本输出
+_PG_TYPES: dict[int, tuple[str, Optional[pa.DataType]]] = {
+    16: ("boolean", pa.bool_()),
+    17: ("bytea", pa.binary()),
+    18: ("char", pa.string()),
+    19: ("name", pa.string()),
+    20: ("bigint", pa.int64()),
+    21: ("smallint", pa.int16()),
+    23: ("integer", pa.int32()),
+    25: ("text", pa.string()),
+    26: ("oid", pa.int64()),
+    114: ("json", None),
+    700: ("real", pa.float32()),
+    701: ("double precision", pa.float64()),
+    1042: ("character", pa.string()),
+    1043: ("character varying", pa.string()),
+    1082: ("date", pa.date32()),
+    1083: ("time", pa.time64("us")),
+    1114: ("timestamp", pa.timestamp("us")),
+    1184: ("timestamptz", pa.timestamp("us", tz="UTC")),
+    1186: ("interval", pa.duration("us")),
+    1700: ("numeric", pa.float64()),
+    2950: ("uuid", None),
+    3802: ("jsonb", None),
+}
+
+
+def _type_code(column) -> Optional[int]:
+    code = getattr(column, "type_code", None)
+    if code is None and isinstance(column, tuple) and len(column) > 1:
+        code = column[1]
+    return code if isinstance(code, int) else None
+
+
+def result_columns(keys: Sequence[str], description) -> List[QueryColumn]:
+    """Column names from the result plus type names taken from the DB-API cursor description."""
+    columns = []
+    for i, name in enumerate(keys):
+        code = _type_code(description[i]) if description else None
+        type_name = _PG_TYPES[code][0] if code in _PG_TYPES else None
+        columns.append(QueryColumn(name=name, type=type_name))
+    return columns
+
+
+def _numeric_type(column) -> pa.DataType:
+    # 声明了精度的 numeric 保留为 decimal，否则（如 avg() 结果）用 float64
+    precision = getattr(column, "precision", None)
+    scale = getattr(column, "scale", None)
+    if precision and scale is not None and 0 < precision <= 38:
+        return pa.decimal128(precision, scale)
+    return pa.float64()
+
+
+def arrow_schema(keys: Sequence[str], description) -> pa.Schema:
+    fields = []
+    for i, name in enumerate(keys):
+        column = description[i] if description else None
+        code = _type_code(column)
+        if code == 1700:
+            arrow_type = _numeric_type(column)
+        else:
+            arrow_type = (_PG_TYPES.get(code) or (None, None))[1] or pa.string()
+        fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields)
+
+
+def _to_text(value: Any) -> Optional[str]:
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    return str(value)
+
+
+def _convert(values: List[Any], arrow_type: pa.DataType) -> List[Any]:
+    if pa.types.is_string(arrow_type):
+        return [_to_text(v) for v in values]
+    if pa.types.is_floating(arrow_type):
+        return [float(v) if isinstance(v, Decimal) else v for v in values]
+    return values
+
+
+def record_batch(schema: pa.Schema, rows: Iterable[Sequence[Any]]) -> pa.RecordBatch:
+    columns = list(zip(*rows)) or [()] * len(schema)
+    arrays = [
+        pa.array(_convert(list(values), field.type), type=field.type)
+        for values, field in zip(columns, schema)
+    ]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
@@ -0,0 +1,101 @@
+from typing import List, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.db import metadata_store
+from app.models.connection import CatalogSearchHit
+
+# trigram 分词至少需要 3 个字符；更短的查询按前缀 LIKE 处理
+_MIN_FTS_LENGTH = 3
+# 每类（表/列）最多取多少候选再在 Python 里打分；达到上限时结果标记为 truncated
+_CANDIDATE_LIMIT = 5000
+# 模糊匹配：查询与名字的 trigram 相似度下限
+_FUZZY_THRESHOLD = 0.3
+
+
+def _trigrams(value: str) -> set[str]:
+    return {value[i : i + 3] for i in range(len(value) - 2)}
+
+
+def _similarity(a: str, b: str) -> float:
+    # 与 pg_trgm 相同：两端补空格后算 trigram 的 Jaccard 相似度，首尾一致的名字得分更高
+    wanted, found = _trigrams(f"  {a} "), _trigrams(f"  {b} ")
+    return len(wanted & found) / len(wanted | found)
+
+
+def _phrase(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _score(query: str, name: str, fuzzy: bool) -> float:
+    """1 for an exact match, then prefix, then substring; fuzzy hits rank below all of them."""
+    name = name.lower()
+    if name == query:
+        return 1.0
+    coverage = len(query) / len(name)
+    if name.startswith(query):
+        return round(0.8 + 0.1 * coverage, 4)
+    if query in name:
+        return round(0.6 + 0.1 * coverage, 4)
+    if fuzzy and len(query) >= _MIN_FTS_LENGTH:
+        similarity = _similarity(query, name)
+        if similarity >= _FUZZY_THRESHOLD:
+            return round(0.5 * similarity, 4)
+    return 0.0
+
+
+def _candidates(db: Session, connection_id: int, kind: str, query: str, fuzzy: bool) -> list:
+    if metadata_store.fts_enabled and len(query) >= _MIN_FTS_LENGTH:
+        # 模糊模式按 trigram 做 OR 召回（bm25 排序，包含所有子串匹配），非模糊只取整串子串匹配
+        match = " OR ".join(_phrase(t) for t in sorted(_trigrams(query))) if fuzzy else _phrase(query)
+        return metadata_store.search_catalog(db, connection_id, kind, _CANDIDATE_LIMIT, match=match)
+    pattern = _escape_like(query)
+    like = f"%{pattern}%" if len(query) >= _MIN_FTS_LENGTH else f"{pattern}%"
+    return metadata_store.search_catalog(db, connection_id, kind, _CANDIDATE_LIMIT, like=like)
+
+
+def search(
+    db: Session, connection_id: int, query: str, kind: str = "all", fuzzy: bool = True, limit: int = 50, offset: int = 0
+) -> Tuple[int, bool, List[CatalogSearchHit]]:
+    """
+    Search synced table and column names of a connection.
+
+    Returns (total, truncated, page): hits ranked exact > prefix > substring >
+    fuzzy (trigram similarity), sliced by offset/limit. `truncated` is set when
+    a candidate list hit its cap, so total is a lower bound.
+    """
+    metadata_store.init_db()
+    query = query.strip().lower()
+    if not query:
+        return 0, False, []
+
+    kinds = ("table", "column") if kind == "all" else (kind,)
+    scored = []
+    truncated = False
+    for k in kinds:
+        candidates = _candidates(db, connection_id, k, query, fuzzy)
+        truncated = truncated or len(candidates) >= _CANDIDATE_LIMIT
+        for hit_kind, schema, table, is_view, column, data_type in candidates:
+            name = column if hit_kind == "column" else table
+            score = _score(query, name, fuzzy)
+            if score > 0:
+                scored.append((score, hit_kind, schema, table, is_view, column, data_type))
+    scored.sort(key=lambda h: (-h[0], len(h[5] or h[3]), h[2], h[3], h[5] or ""))
+
+    page = [
+        CatalogSearchHit(
+            kind=hit_kind,
+            schema=schema,
+            table=table,
+            is_view=is_view,
+            column=column,
+            data_type=data_type,
+            score=score,
+        )
+        for score, hit_kind, schema, table, is_view, column, data_type in scored[offset : offset + limit]
+    ]
+    return len(scored), truncated, page
@@ -1,71 +1,250 @@
+import hashlib
 import json
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import List, Optional
 
+from pydantic import TypeAdapter
 from sqlalchemy import text
-from sqlalchemy import create_engine
 from sqlalchemy.orm import Session
 
+from app.core.config import get_settings
 from app.db import metadata_store
-from app.models.connection import ColumnInfo, TableInfo
-
-
-def fetch_postgres_metadata(connection_url: str) -> List[TableInfo]:
-    engine = create_engine(connection_url)
-    query = text(
-        """
-        SELECT t.table_schema,
-               t.table_name,
-               t.table_type,
-               c.column_name,
-               c.data_type
-        FROM information_schema.tables t
-        JOIN information_schema.columns c
-          ON t.table_schema = c.table_schema AND t.table_name = c.table_name
-        WHERE t.table_schema NOT IN ('pg_catalog', 'information_schema')
-        ORDER BY t.table_schema, t.table_name, c.ordinal_position;
-        """
-    )
-    with engine.connect() as conn:
-        rows = conn.execute(query).all()
-
-    tables: dict[tuple[str, str], dict] = {}
-    for schema, table_name, table_type, col_name, data_type in rows:
-        key = (schema, table_name)
-        if key not in tables:
-            tables[key] = {
-                "schema": schema,
+from app.db.manager import manager
+from app.models.connection import TableInfo
+
+
+_TABLE_LIST = TypeAdapter(List[TableInfo])
+# 没有主键/外键的表存这个固定串，读取时不必解析
+_NO_CONSTRAINTS = json.dumps({"primary_key": [], "foreign_keys": []})
+
+# 直接查 pg_catalog：information_schema 视图在对象很多的库上非常慢
+_SCHEMA_FILTERS = {
+    "all": "n.nspname <> 'information_schema' AND n.nspname NOT LIKE 'pg\\_%'",
+    "one": "n.nspname = :schema",
+}
+
+_SCHEMAS_SQL = f"""
+SELECT n.nspname
+FROM pg_namespace n
+WHERE {_SCHEMA_FILTERS["all"]}
+ORDER BY n.nspname
+"""
+
+# 每个表一行；列按 attnum 在 LATERAL 子查询里聚合（走 pg_attribute 索引，避免整体排序落盘）
+_TABLES_SQL = """
+SELECT c.oid,
+       n.nspname,
+       c.relname,
+       c.relkind IN ('v', 'm') AS is_view,
+       c.reltuples::bigint AS reltuples,
+       cols.attnums,
+       cols.names,
+       cols.types
+FROM pg_class c
+JOIN pg_namespace n ON n.oid = c.relnamespace
+CROSS JOIN LATERAL (
+    SELECT array_agg(a.attnum::int ORDER BY a.attnum) AS attnums,
+           array_agg(a.attname::text ORDER BY a.attnum) AS names,
+           array_agg(format_type(a.atttypid, NULL) ORDER BY a.attnum) AS types
+    FROM pg_attribute a
+    WHERE a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+) cols
+WHERE c.relkind IN ('r', 'p', 'v', 'm', 'f')
+  AND {schema_filter}
+  AND cols.attnums IS NOT NULL
+  AND has_any_column_privilege(c.oid, 'SELECT, INSERT, UPDATE, REFERENCES')
+ORDER BY n.nspname, c.relname
+"""
+
+# 约束只取 attnum 数组，列名在 Python 里用上面的结果解析
+_CONSTRAINTS_SQL = """
+SELECT con.conrelid, con.contype, con.conname, con.conkey::int[], con.confrelid, con.confkey::int[]
+FROM pg_constraint con
+JOIN pg_namespace n ON n.oid = con.connamespace
+WHERE con.contype IN ('p', 'f')
+  AND {schema_filter}
+ORDER BY con.conrelid, con.conname
+"""
+
+# 外键引用了未抓取到的表（无权限或在其他 schema 批次之外）时补查
+_RELATIONS_SQL = """
+SELECT c.oid,
+       n.nspname,
+       c.relname,
+       ARRAY(SELECT a.attnum::int FROM pg_attribute a WHERE a.attrelid = c.oid AND a.attnum > 0 ORDER BY a.attnum),
+       ARRAY(SELECT a.attname::text FROM pg_attribute a WHERE a.attrelid = c.oid AND a.attnum > 0 ORDER BY a.attnum)
+FROM pg_class c
+JOIN pg_namespace n ON n.oid = c.relnamespace
+WHERE c.oid = ANY(:oids)
+"""
+
+
+def _fetch_catalog(connection_id: int, connection_url: str, schema: Optional[str] = None) -> tuple[list, list]:
+    schema_filter = _SCHEMA_FILTERS["all" if schema is None else "one"]
+    params = {"schema": schema} if schema is not None else {}
+    with manager.connect(connection_id, connection_url) as conn:
+        table_rows = conn.execute(text(_TABLES_SQL.format(schema_filter=schema_filter)), params).all()
+        constraint_rows = conn.execute(text(_CONSTRAINTS_SQL.format(schema_filter=schema_filter)), params).all()
+    return table_rows, constraint_rows
+
+
+def _build_tables(connection_id: int, connection_url: str, table_rows: list, constraint_rows: list) -> List[TableInfo]:
+    # oid -> (schema, name, {attnum: column name})
+    relations = {
+        oid: (schema_name, table_name, dict(zip(attnums, names)))
+        for oid, schema_name, table_name, _, _, attnums, names, _ in table_rows
+    }
+    missing = {row[4] for row in constraint_rows if row[1] == "f" and row[4] not in relations}
+    if missing:
+        with manager.connect(connection_id, connection_url) as conn:
+            for oid, schema_name, table_name, attnums, names in conn.execute(
+                text(_RELATIONS_SQL), {"oids": list(missing)}
+            ):
+                relations[oid] = (schema_name, table_name, dict(zip(attnums, names)))
+
+    primary_keys: dict[int, List[str]] = {}
+    foreign_keys: dict[int, List[dict]] = {}
+    for relid, contype, conname, conkey, confrelid, confkey in constraint_rows:
+        if relid not in relations:
+            continue
+        columns = [relations[relid][2].get(attnum, "") for attnum in conkey]
+        if contype == "p":
+            primary_keys[relid] = columns
+        elif confrelid in relations:
+            ref_schema, ref_table, ref_names = relations[confrelid]
+            foreign_keys.setdefault(relid, []).append(
+                {
+                    "name": conname,
+                    "columns": columns,
+                    "ref_schema": ref_schema,
+                    "ref_table": ref_table,
+                    "ref_columns": [ref_names.get(attnum, "") for attnum in confkey],
+                }
+            )
+
+    # 先拼普通 dict，再一次性交给 pydantic 校验，比逐个构造模型快得多
+    return _TABLE_LIST.validate_python(
+        [
+            {
+                "schema": schema_name,
                 "name": table_name,
-                "is_view": table_type.lower() == "view",
-                "columns": [],
+                "is_view": is_view,
+                "columns": [{"name": n, "data_type": t} for n, t in zip(names, types)],
+                "primary_key": primary_keys.get(oid, []),
+                "foreign_keys": foreign_keys.get(oid, []),
+                # reltuples 为 -1（PG14+）表示从未 ANALYZE；视图没有行数
+                "row_estimate": None if is_view or reltuples < 0 else reltuples,
             }
-        tables[key]["columns"].append({"name": col_name, "data_type": data_type})
-
-    return [
-        TableInfo(
-            schema=v["schema"],
-            name=v["name"],
-            is_view=v["is_view"],
-            columns=[ColumnInfo(**c) for c in v["columns"]],
+            for oid, schema_name, table_name, is_view, reltuples, _, names, types in table_rows
+        ]
+    )
+
+
+def fetch_postgres_metadata(connection_id: int, connection_url: str, parallelism: Optional[int] = None) -> List[TableInfo]:
+    """
+    Read tables, columns, primary/foreign keys and row estimates from pg_catalog.
+
+    With parallelism > 1 (default METADATA_SYNC_PARALLELISM) each schema is
+    fetched separately, concurrently on pooled connections.
+    """
+    if parallelism is None:
+        parallelism = get_settings().metadata_sync_parallelism
+
+    schemas: List[str] = []
+    if parallelism > 1:
+        with manager.connect(connection_id, connection_url) as conn:
+            schemas = conn.execute(text(_SCHEMAS_SQL)).scalars().all()
+    if len(schemas) <= 1:
+        table_rows, constraint_rows = _fetch_catalog(connection_id, connection_url)
+    else:
+        table_rows, constraint_rows = [], []
+        with ThreadPoolExecutor(max_workers=min(parallelism, len(schemas))) as pool:
+            for tables_part, constraints_part in pool.map(
+                lambda schema: _fetch_catalog(connection_id, connection_url, schema), schemas
+            ):
+                table_rows.extend(tables_part)
+                constraint_rows.extend(constraints_part)
+    return _build_tables(connection_id, connection_url, table_rows, constraint_rows)
+
+
+def export_table_dicts(db: Session, connection_id: int, rows: List[metadata_store.TableMetadata]) -> List[dict]:
+    """Assemble stored tables and their normalized column rows into plain dicts in the TableInfo shape."""
+    columns = metadata_store.get_columns(db, connection_id)
+    tables = []
+    for row in rows:
+        constraints = (
+            json.loads(row.constraints_json) if row.constraints_json and row.constraints_json != _NO_CONSTRAINTS else {}
         )
-        for v in tables.values()
-    ]
+        tables.append(
+            {
+                "schema": row.schema,
+                "name": row.name,
+                "is_view": row.is_view,
+                "columns": [{"name": n, "data_type": t} for n, t in columns.get(row.id, [])],
+                "primary_key": constraints.get("primary_key", []),
+                "foreign_keys": constraints.get("foreign_keys", []),
+                "row_estimate": row.row_estimate,
+            }
+        )
+    return tables
+
 
+def export_tables(db: Session, connection_id: int, rows: List[metadata_store.TableMetadata]) -> List[TableInfo]:
+    return _TABLE_LIST.validate_python(export_table_dicts(db, connection_id, rows))
 
-def sync_metadata(db: Session, connection_url: str, name: str | None = None):
+
+def _fingerprint(is_view: bool, columns_json: str, constraints_json: str, row_estimate: Optional[int]) -> str:
+    # 行数估算只取数量级（约翻倍才变化），否则每次同步几乎所有表都会被判为已变更
+    magnitude = -1 if row_estimate is None else row_estimate.bit_length()
+    return hashlib.sha1(f"{int(is_view)}:{magnitude}:{columns_json}:{constraints_json}".encode()).hexdigest()
+
+
+def register_connection(db: Session, connection_url: str, name: str | None = None):
     # ensure sqlite metadata tables exist
     metadata_store.init_db()
+    return metadata_store.upsert_connection(db, connection_url=str(connection_url), name=name)
+
+
+def refresh_metadata(db: Session, connection_id: int) -> dict:
+    """Introspect the target database and store what changed; returns the per-action counts."""
+    metadata_store.init_db()
+    conn = metadata_store.get_connection(db, connection_id)
+    if not conn:
+        raise ValueError("Connection not found")
+    tables = fetch_postgres_metadata(conn.id, conn.connection_url)
 
-    url_str = str(connection_url)
-    conn = metadata_store.upsert_connection(db, connection_url=url_str, name=name)
-    tables = fetch_postgres_metadata(url_str)
+    serialized = []
+    for t in tables:
+        # 指纹沿用列的 JSON 序列化，已存储的指纹仍然有效
+        columns_json = json.dumps([c.model_dump() for c in t.columns])
+        constraints_json = (
+            json.dumps({"primary_key": t.primary_key, "foreign_keys": [fk.model_dump() for fk in t.foreign_keys]})
+            if t.primary_key or t.foreign_keys
+            else _NO_CONSTRAINTS
+        )
+        serialized.append(
+            {
+                "schema": t.schema,
+                "name": t.name,
+                "is_view": t.is_view,
+                "columns": [(c.name, c.data_type) for c in t.columns],
+                "constraints_json": constraints_json,
+                "row_estimate": t.row_estimate,
+                "fingerprint": _fingerprint(t.is_view, columns_json, constraints_json, t.row_estimate),
+            }
+        )
+    changes = metadata_store.sync_table_metadata(db, conn.id, serialized)
+    metadata_store.update_last_synced(db, conn.id)
+    return changes
 
-    serialized = [
-        (t.schema, t.name, t.is_view, json.dumps([c.model_dump() for c in t.columns]))
-        for t in tables
-    ]
-    metadata_store.replace_metadata(db, conn.id, serialized)
-    conn = metadata_store.update_last_synced(db, conn.id)
-    return conn, tables
+
+def is_stale(conn: metadata_store.Connection) -> bool:
+    """Never synced, or last synced longer ago than METADATA_REFRESH_INTERVAL (0 = never stale)."""
+    if conn.last_synced is None:
+        return True
+    interval = get_settings().metadata_refresh_interval
+    return interval > 0 and (datetime.utcnow() - conn.last_synced).total_seconds() > interval
 
 
 def list_connections(db: Session):
@@ -73,6 +252,11 @@ def list_connections(db: Session):
     return metadata_store.list_connections(db)
 
 
+def get_connection(db: Session, connection_id: int):
+    metadata_store.init_db()
+    return metadata_store.get_connection(db, connection_id)
+
+
 def get_metadata(db: Session, connection_id: int):
     metadata_store.init_db()
     return metadata_store.get_metadata(db, connection_id)
@@ -80,5 +264,9 @@ def get_metadata(db: Session, connection_id: int):
 
 def update_connection_name(db: Session, connection_id: int, name: str | None):
     metadata_store.init_db()
-    return metadata_store.update_connection_name(db, connection_id, name)
+    updated = metadata_store.update_connection_name(db, connection_id, name)
+    if updated:
+        # 连接信息变更后释放旧连接池，下次使用时按最新配置重建
+        manager.dispose(connection_id)
+    return updated
 
@@ -5,6 +5,11 @@ def build_context(tables: list[TableInfo]) -> str:
     lines = []
     for t in tables:
         cols = ", ".join([c.get("name") if isinstance(c, dict) else getattr(c, "name", "") for c in t.columns])
-        lines.append(f"{t.schema}.{t.name} ({'VIEW' if t.is_view else 'TABLE'}): {cols}")
+        line = f"{t.schema}.{t.name} ({'VIEW' if t.is_view else 'TABLE'}): {cols}"
+        if t.primary_key:
+            line += f"; PK ({', '.join(t.primary_key)})"
+        for fk in t.foreign_keys:
+            line += f"; FK ({', '.join(fk.columns)}) -> {fk.ref_schema}.{fk.ref_table} ({', '.join(fk.ref_columns)})"
+        lines.append(line)
     return "\n".join(lines)
 
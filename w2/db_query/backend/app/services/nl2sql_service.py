@@ -1,15 +1,16 @@
 from typing import List
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 from openai import OpenAI
 
 from app.db import metadata_store
+from app.db.manager import manager
 from app.models.nl_query import NLQueryRequest, NLQueryResponse
 from app.models.connection import TableInfo
+from app.services import metadata_service
 from app.services.sql_guard import validate_and_patch
 from app.services.nl2sql_prompt import build_context
 from app.core.config import get_settings
-import json
 
 
 def _pick_table(tables: List[TableInfo]) -> TableInfo:
@@ -64,24 +65,14 @@ def generate_and_run(db: Session, payload: NLQueryRequest) -> NLQueryResponse:
     conn, raw_tables = meta
 
     # parse stored tables to TableInfo
-    tables: List[TableInfo] = []
-    for t in raw_tables:
-        tables.append(
-            TableInfo(
-                schema=t.schema,
-                name=t.name,
-                is_view=t.is_view,
-                columns=[c for c in (t.columns_json and json.loads(t.columns_json) or [])],
-            )
-        )
+    tables: List[TableInfo] = metadata_service.export_tables(db, conn.id, raw_tables)
 
     context = build_context(tables)
     generated_sql = generate_sql(payload.prompt, tables, payload.api_key)
 
     patched_sql, limit_added = validate_and_patch(generated_sql)
 
-    engine = create_engine(conn.connection_url)
-    with engine.connect() as connection:
+    with manager.connect(conn.id, conn.connection_url) as connection:
         result = connection.execute(text(patched_sql))
         rows = result.fetchall()
         columns = [col for col in result.keys()]
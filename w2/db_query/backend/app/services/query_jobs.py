@@ -0,0 +1,210 @@
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Deque, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.db import metadata_store
+from app.db.manager import manager
+from app.models.query import QueryRequest, QueryResult
+from app.services.arrow_format import result_columns
+from app.services.sql_guard import DEFAULT_LIMIT, validate_and_patch
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+
+@dataclass
+class QueryJob:
+    id: str
+    connection_id: int
+    connection_url: str
+    sql: str
+    limit_added: bool
+    status: str = QUEUED
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    result: Optional[QueryResult] = None
+    backend_pid: Optional[int] = None
+    cancel_requested: bool = False
+    finished_monotonic: float = 0.0
+    # 发出 pg_cancel_backend 期间持有；_run 在归还连接前也要取它来清掉 backend_pid
+    cancel_lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+
+class JobNotFoundError(ValueError):
+    pass
+
+
+class QueryJobManager:
+    """
+    Runs submitted queries on a dedicated thread pool, outside the API's threads.
+
+    At most `per_connection` jobs run at once against each saved connection;
+    further jobs wait in a per-connection FIFO. Every job runs with a
+    transaction-local statement_timeout, and a running job can be cancelled
+    with pg_cancel_backend. Finished jobs are kept for `retention` seconds.
+    """
+
+    def __init__(self, workers: int, per_connection: int, statement_timeout_ms: int, retention: float) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="query-job")
+        self._per_connection = per_connection
+        self._statement_timeout_ms = statement_timeout_ms
+        self._retention = retention
+        self._jobs: Dict[str, QueryJob] = {}
+        self._pending: Dict[int, Deque[QueryJob]] = {}
+        self._running: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, db: Session, payload: QueryRequest) -> QueryJob:
+        metadata_store.init_db()
+        conn = metadata_store.get_connection(db, payload.connection_id)
+        if not conn:
+            raise ValueError("Connection not found")
+        patched_sql, limit_added = validate_and_patch(payload.sql)
+
+        job = QueryJob(
+            id=uuid.uuid4().hex,
+            connection_id=conn.id,
+            connection_url=conn.connection_url,
+            sql=patched_sql,
+            limit_added=limit_added,
+        )
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+            if self._running.get(conn.id, 0) < self._per_connection:
+                self._start(job)
+            else:
+                self._pending.setdefault(conn.id, deque()).append(job)
+        return job
+
+    def get(self, job_id: str) -> QueryJob:
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            raise JobNotFoundError("Job not found")
+        return job
+
+    def cancel(self, job_id: str) -> QueryJob:
+        job = self.get(job_id)
+        with self._lock:
+            if job.status in FINISHED:
+                return job
+            job.cancel_requested = True
+            if job.status == QUEUED:
+                # 还在排队，或已交给线程池但没拿到连接：_run 开始时看到标记会直接退出
+                queue = self._pending.get(job.connection_id)
+                if queue and job in queue:
+                    queue.remove(job)
+                self._finish(job, CANCELLED, error="Cancelled before start")
+                return job
+            if job.backend_pid is None:
+                # 非 Postgres 目标库，或查询已结束正在归还连接
+                return job
+        # 先借好发取消用的连接再取 cancel_lock，避免与 _run 归还连接互相等待
+        with manager.connect(job.connection_id, job.connection_url) as connection:
+            with job.cancel_lock:
+                # 持锁期间查询所在的连接不会被归还，pid 不会被其他任务复用
+                pid = job.backend_pid
+                if pid is not None:
+                    # 目标查询会以 QueryCanceled 失败
+                    connection.execute(text("SELECT pg_cancel_backend(:pid)"), {"pid": pid})
+        return job
+
+    def shutdown(self) -> None:
+        with self._lock:
+            for queue in self._pending.values():
+                for job in queue:
+                    self._finish(job, CANCELLED, error="Server shutting down")
+            self._pending.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _start(self, job: QueryJob) -> None:
+        # 调用方持有锁；任务拿到连接后才在 _run 里标记为 RUNNING
+        self._running[job.connection_id] = self._running.get(job.connection_id, 0) + 1
+        self._executor.submit(self._run, job)
+
+    def _run(self, job: QueryJob) -> None:
+        try:
+            with manager.connect(job.connection_id, job.connection_url) as connection:
+                pid = None
+                if connection.dialect.name == "postgresql":
+                    # is_local=true：只对本事务生效，连接归还连接池后自动恢复
+                    connection.execute(
+                        text("SELECT set_config('statement_timeout', :ms, true)"),
+                        {"ms": str(self._statement_timeout_ms)},
+                    )
+                    pid = connection.execute(text("SELECT pg_backend_pid()")).scalar()
+                with self._lock:
+                    if job.cancel_requested:
+                        raise RuntimeError("Cancelled before start")
+                    job.status = RUNNING
+                    job.started_at = datetime.utcnow()
+                    job.backend_pid = pid
+                try:
+                    result = connection.execute(text(job.sql))
+                    columns = result_columns(list(result.keys()), result.cursor.description)
+                    rows = [list(r) for r in result.fetchall()]
+                finally:
+                    # 归还连接前清掉 pid；若取消正在发出，等它发完再归还
+                    with job.cancel_lock:
+                        job.backend_pid = None
+            message = f"LIMIT {DEFAULT_LIMIT} applied automatically" if job.limit_added else None
+            outcome = QueryResult(columns=columns, rows=rows, limit_added=job.limit_added, message=message)
+            with self._lock:
+                job.result = outcome
+                self._finish(job, SUCCEEDED)
+        except Exception as exc:
+            with self._lock:
+                if job.status not in FINISHED:
+                    status = CANCELLED if job.cancel_requested else FAILED
+                    self._finish(job, status, error=str(exc))
+        finally:
+            with self._lock:
+                self._release(job.connection_id)
+
+    def _finish(self, job: QueryJob, status: str, error: Optional[str] = None) -> None:
+        # 调用方持有锁
+        job.status = status
+        job.error = error
+        job.finished_at = datetime.utcnow()
+        job.finished_monotonic = time.monotonic()
+
+    def _release(self, connection_id: int) -> None:
+        self._running[connection_id] -= 1
+        queue = self._pending.get(connection_id)
+        if queue:
+            self._start(queue.popleft())
+
+    def _prune(self) -> None:
+        deadline = time.monotonic() - self._retention
+        for job_id, job in list(self._jobs.items()):
+            if job.status in FINISHED and job.finished_monotonic < deadline:
+                del self._jobs[job_id]
+
+
+def _build_manager() -> QueryJobManager:
+    settings = get_settings()
+    return QueryJobManager(
+        workers=settings.query_job_workers,
+        per_connection=settings.query_job_max_per_connection,
+        statement_timeout_ms=settings.query_statement_timeout_ms,
+        retention=settings.query_job_retention,
+    )
+
+
+jobs = _build_manager()
@@ -1,31 +1,152 @@
-from typing import List
-from sqlalchemy import create_engine, text
+import io
+from contextlib import ExitStack
+from typing import Iterator, List, Tuple
+import pyarrow as pa
+from sqlalchemy import text
+from sqlalchemy.engine import CursorResult
 from sqlalchemy.orm import Session
+from pydantic_core import to_json
 
+from app.core.config import get_settings
 from app.db import metadata_store
+from app.db.manager import manager
 from app.models.query import QueryRequest, QueryResult, QueryColumn
-from app.services.sql_guard import validate_and_patch, SqlValidationError
+from app.services.arrow_format import arrow_schema, record_batch, result_columns
+from app.services.result_cache import cache
+from app.services.sql_guard import DEFAULT_LIMIT, validate_and_patch, SqlValidationError
 
 
-def run_query(db: Session, payload: QueryRequest) -> QueryResult:
+def _get_connection(db: Session, connection_id: int) -> metadata_store.Connection:
     # ensure metadata store exists
     metadata_store.init_db()
-    meta = metadata_store.get_metadata(db, payload.connection_id)
-    if not meta:
+    conn = metadata_store.get_connection(db, connection_id)
+    if not conn:
         raise ValueError("Connection not found")
-    conn, _ = meta
-    conn_url = conn.connection_url
+    return conn
+
+
+def _limit_message(limit_added: bool) -> str | None:
+    return f"LIMIT {DEFAULT_LIMIT} applied automatically" if limit_added else None
+
+
+def run_query(db: Session, payload: QueryRequest) -> QueryResult:
+    conn = _get_connection(db, payload.connection_id)
 
     patched_sql, limit_added = validate_and_patch(payload.sql)
 
-    engine = create_engine(conn_url)
-    with engine.connect() as connection:
+    # sqlglot 重新生成的 SQL 作为规范化键：大小写、空白不同的同一查询共享缓存
+    cache_key = (conn.id, patched_sql)
+    use_cache = payload.use_cache and cache.enabled
+    if use_cache:
+        hit = cache.get(cache_key)
+        if hit:
+            cached, age = hit
+            note = f"Served from cache ({age:.0f}s old)"
+            message = f"{cached.message}; {note}" if cached.message else note
+            return cached.model_copy(update={"message": message})
+
+    with manager.connect(conn.id, conn.connection_url) as connection:
         result = connection.execute(text(patched_sql))
+        columns: List[QueryColumn] = result_columns(list(result.keys()), result.cursor.description)
         rows = result.fetchall()
 
-        # Use result.keys() for column names; type info optional
-        columns: List[QueryColumn] = [QueryColumn(name=col) for col in result.keys()]
+    query_result = QueryResult(columns=columns, rows=[list(r) for r in rows], limit_added=limit_added, message=_limit_message(limit_added))
+    if use_cache:
+        cache.set(cache_key, conn.id, query_result)
+    return query_result
+
+
+def invalidate_cache(connection_id: int | None = None) -> int:
+    return cache.invalidate(connection_id)
+
+
+def _execute_streaming(db: Session, payload: QueryRequest, unlimited: bool) -> Tuple[ExitStack, CursorResult, bool, int]:
+    """
+    Validate and execute on a server-side cursor; returns (stack, result, limit_added, batch_rows).
+
+    Closing `stack` releases the connection. Validation, checkout and execution
+    happen here, before any byte is sent, so those errors surface as normal
+    HTTP errors.
+    """
+    settings = get_settings()
+    if unlimited and not settings.query_stream_allow_unlimited:
+        raise SqlValidationError("Unlimited results are disabled on this server")
+    conn = _get_connection(db, payload.connection_id)
+
+    limit = None if unlimited else DEFAULT_LIMIT
+    patched_sql, limit_added = validate_and_patch(payload.sql, limit=limit)
+
+    stack = ExitStack()
+    try:
+        connection = stack.enter_context(manager.connect(conn.id, conn.connection_url))
+        # stream_results 使用服务端游标，按批取行，内存占用与结果集大小无关
+        result = connection.execution_options(
+            stream_results=True, max_row_buffer=settings.query_stream_batch_rows
+        ).execute(text(patched_sql))
+    except Exception:
+        stack.close()
+        raise
+    return stack, result, limit_added, settings.query_stream_batch_rows
+
+
+def stream_query(db: Session, payload: QueryRequest) -> Iterator[bytes]:
+    """
+    Execute the query on a server-side cursor and return an NDJSON byte stream.
+
+    The first line is a header object (columns, limitAdded, message), then one
+    JSON array per row, then {"done": true, "rowCount": n}. An error after the
+    header is reported as a final {"error": "..."} line.
+    """
+    stack, result, limit_added, batch_rows = _execute_streaming(db, payload, payload.unlimited)
+    header = {
+        "columns": [c.model_dump() for c in result_columns(list(result.keys()), result.cursor.description)],
+        "limitAdded": limit_added,
+        "message": _limit_message(limit_added),
+    }
+    return _ndjson_lines(stack, result, header, batch_rows)
+
+
+def _ndjson_lines(stack: ExitStack, result: CursorResult, header: dict, batch_rows: int) -> Iterator[bytes]:
+    with stack:
+        yield to_json(header) + b"\n"
+        row_count = 0
+        try:
+            for batch in result.partitions(batch_rows):
+                row_count += len(batch)
+                yield b"".join(to_json(list(row)) + b"\n" for row in batch)
+        except Exception as exc:
+            yield to_json({"error": str(exc)}) + b"\n"
+            return
+        yield to_json({"done": True, "rowCount": row_count}) + b"\n"
+
+
+def stream_arrow(db: Session, payload: QueryRequest) -> Iterator[bytes]:
+    """
+    Execute the query and return an Arrow IPC stream, one record batch per fetched chunk.
+
+    Column types come from the cursor description. The auto-LIMIT applies as
+    for /query unless `unlimited` is set and allowed. If the query fails
+    mid-stream the connection is closed and the stream ends without its
+    end-of-stream marker, which Arrow readers report as an error.
+    """
+    stack, result, _, batch_rows = _execute_streaming(db, payload, payload.unlimited)
+    schema = arrow_schema(list(result.keys()), result.cursor.description)
+    return _arrow_batches(stack, result, schema, batch_rows)
+
+
+def _arrow_batches(stack: ExitStack, result: CursorResult, schema: pa.Schema, batch_rows: int) -> Iterator[bytes]:
+    with stack:
+        sink = io.BytesIO()
+        with pa.ipc.new_stream(sink, schema) as writer:
+            for batch in result.partitions(batch_rows):
+                writer.write_batch(record_batch(schema, batch))
+                # 每写一批就把缓冲内容发出并清空，内存只保留一批
+                yield _drain(sink)
+        yield _drain(sink)
 
-    message = "LIMIT 1000 applied automatically" if limit_added else None
-    return QueryResult(columns=columns, rows=[list(r) for r in rows], limit_added=limit_added, message=message)
 
+def _drain(sink: io.BytesIO) -> bytes:
+    data = sink.getvalue()
+    sink.seek(0)
+    sink.truncate()
+    return data
@@ -0,0 +1,105 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Hashable, Optional
+
+from pydantic_core import to_json
+
+from app.core.config import get_settings
+from app.models.query import QueryResult
+
+
+@dataclass
+class _Entry:
+    connection_id: int
+    result: QueryResult
+    size: int
+    stored_at: float
+
+
+class ResultCache:
+    """
+    In-process cache of query results with a TTL and a total byte budget.
+
+    Keys are (connection_id, canonical SQL, ...) tuples. Entries are evicted
+    least recently used first once the serialized size of all entries
+    exceeds `max_bytes`; results larger than a quarter of the budget are
+    not cached at all.
+    """
+
+    def __init__(self, ttl: float, max_bytes: int) -> None:
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_bytes > 0
+
+    def get(self, key: Hashable) -> Optional[tuple[QueryResult, float]]:
+        """Return (result, age in seconds) or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry.stored_at > self.ttl:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.result, time.monotonic() - entry.stored_at
+
+    def set(self, key: Hashable, connection_id: int, result: QueryResult) -> None:
+        size = len(to_json(result))
+        if size > self.max_bytes // 4:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = _Entry(connection_id, result, size, time.monotonic())
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, connection_id: Optional[int] = None) -> int:
+        """Drop entries of one connection (or all when None); returns how many were dropped."""
+        with self._lock:
+            keys = [
+                key
+                for key, entry in self._entries.items()
+                if connection_id is None or entry.connection_id == connection_id
+            ]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+
+def _build_cache() -> ResultCache:
+    settings = get_settings()
+    return ResultCache(ttl=settings.query_cache_ttl, max_bytes=settings.query_cache_max_bytes)
+
+
+cache = _build_cache()
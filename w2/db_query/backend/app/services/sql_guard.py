@@ -1,30 +1,89 @@
-from typing import Tuple
+import threading
+import time
+from functools import lru_cache
+from typing import Optional, Tuple
 from sqlglot import parse_one, exp
 
+from app.core.config import get_settings
+
+DEFAULT_LIMIT = 1000
+
+# sqlglot 新版本用 exp.Query 取代了 exp.Subqueryable
+_QUERY_TYPES = (exp.Select, exp.Query) if hasattr(exp, "Query") else (exp.Select, exp.Subqueryable)
+
 
 class SqlValidationError(ValueError):
     pass
 
 
-def validate_and_patch(sql: str) -> Tuple[str, bool]:
+class _ParseStats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.parses = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, elapsed_ms: float) -> None:
+        with self._lock:
+            self.parses += 1
+            self.total_ms += elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+
+
+_stats = _ParseStats()
+
+
+def _parse_and_patch(sql: str, limit: Optional[int]) -> Tuple[Optional[str], bool, Optional[str]]:
+    # 返回 (patched_sql, limit_added, error)；校验失败也作为结果缓存
+    start = time.perf_counter()
+    try:
+        try:
+            tree = parse_one(sql, read="postgres")
+        except Exception as exc:  # pragma: no cover - thin wrapper
+            return None, False, f"SQL parse error: {exc}"
+
+        if not isinstance(tree, _QUERY_TYPES):
+            return None, False, "Only SELECT statements are allowed"
+
+        limit_added = False
+        if limit is not None and not tree.args.get("limit"):
+            tree = tree.limit(limit)
+            limit_added = True
+
+        return tree.sql(dialect="postgres"), limit_added, None
+    finally:
+        _stats.record((time.perf_counter() - start) * 1000)
+
+
+_cached_parse_and_patch = lru_cache(maxsize=get_settings().sql_guard_cache_size)(_parse_and_patch)
+
+
+def validate_and_patch(sql: str, limit: Optional[int] = DEFAULT_LIMIT) -> Tuple[str, bool]:
     """
-    Validate SQL is a SELECT and append LIMIT 1000 if missing.
+    Validate SQL is a SELECT and append LIMIT `limit` if missing.
 
+    Pass limit=None to validate without adding a LIMIT. Outcomes, including
+    validation errors, are memoized per (sql, limit) in a bounded LRU, so a
+    repeated statement is not parsed again.
     Returns (patched_sql, limit_added)
     Raises SqlValidationError if not allowed.
     """
-    try:
-        tree = parse_one(sql, read="postgres")
-    except Exception as exc:  # pragma: no cover - thin wrapper
-        raise SqlValidationError(f"SQL parse error: {exc}") from exc
-
-    if not isinstance(tree, exp.Select) and not isinstance(tree, exp.Subqueryable):
-        raise SqlValidationError("Only SELECT statements are allowed")
-
-    limit_added = False
-    if not tree.args.get("limit"):
-        tree = tree.limit(1000)
-        limit_added = True
+    patched_sql, limit_added, error = _cached_parse_and_patch(sql, limit)
+    if error:
+        raise SqlValidationError(error)
+    return patched_sql, limit_added
 
-    return tree.sql(dialect="postgres"), limit_added
 
+def stats() -> dict:
+    info = _cached_parse_and_patch.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "cache_size": info.currsize,
+        "cache_max_size": info.maxsize,
+        "hits": info.hits,
+        "misses": info.misses,
+        "hit_rate": round(info.hits / lookups, 4) if lookups else 0.0,
+        "parses": _stats.parses,
+        "parse_ms_avg": round(_stats.total_ms / _stats.parses, 3) if _stats.parses else 0.0,
+        "parse_ms_max": round(_stats.max_ms, 3),
+    }
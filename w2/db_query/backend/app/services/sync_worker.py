@@ -0,0 +1,148 @@
+import queue
+import threading
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from app.core.config import get_settings
+from app.db import metadata_store
+from app.db.session import SessionLocal
+from app.services import metadata_service
+
+IDLE = "idle"
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+@dataclass
+class SyncState:
+    connection_id: int
+    status: str = IDLE
+    queued_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    changes: Optional[Dict[str, int]] = None
+    # 运行中又被请求刷新时，本轮结束后再跑一次
+    rerun: bool = False
+
+
+class MetadataSyncWorker:
+    """
+    Refreshes connection metadata in background threads instead of inside requests.
+
+    `enqueue` puts a connection on a FIFO queue; a connection that is already
+    queued is not queued twice, and one requested while running is synced
+    again right after. When `interval` > 0 a scheduler thread also queues
+    every connection whose metadata is older than `interval` seconds.
+    """
+
+    def __init__(self, workers: int, interval: float) -> None:
+        self._workers = max(1, workers)
+        self._interval = interval
+        self._queue: "queue.Queue[Optional[int]]" = queue.Queue()
+        self._states: Dict[int, SyncState] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            self._stop.clear()
+            for i in range(self._workers):
+                self._threads.append(threading.Thread(target=self._work, name=f"metadata-sync-{i}", daemon=True))
+            if self._interval > 0:
+                self._threads.append(threading.Thread(target=self._schedule, name="metadata-sync-scheduler", daemon=True))
+            for thread in self._threads:
+                thread.start()
+
+    def stop(self) -> None:
+        with self._lock:
+            threads, self._threads = self._threads, []
+        self._stop.set()
+        for _ in range(self._workers):
+            self._queue.put(None)
+        for thread in threads:
+            thread.join(timeout=5)
+
+    def enqueue(self, connection_id: int) -> SyncState:
+        self.start()
+        with self._lock:
+            state = self._states.setdefault(connection_id, SyncState(connection_id))
+            if state.status == RUNNING:
+                state.rerun = True
+            elif state.status != QUEUED:
+                state.status = QUEUED
+                state.queued_at = datetime.utcnow()
+                self._queue.put(connection_id)
+            return replace(state)
+
+    def status(self, connection_id: int) -> SyncState:
+        with self._lock:
+            return replace(self._states.get(connection_id) or SyncState(connection_id))
+
+    def _work(self) -> None:
+        while True:
+            connection_id = self._queue.get()
+            if connection_id is None:
+                return
+            with self._lock:
+                state = self._states[connection_id]
+                state.status = RUNNING
+                state.started_at = datetime.utcnow()
+                state.error = None
+            db = SessionLocal()
+            try:
+                changes = metadata_service.refresh_metadata(db, connection_id)
+                outcome = {"status": SUCCEEDED, "changes": changes, "error": None}
+            except Exception as exc:
+                outcome = {"status": FAILED, "changes": None, "error": str(exc)}
+            finally:
+                db.close()
+            with self._lock:
+                for key, value in outcome.items():
+                    setattr(state, key, value)
+                state.finished_at = datetime.utcnow()
+                if state.rerun:
+                    state.rerun = False
+                    state.status = QUEUED
+                    state.queued_at = datetime.utcnow()
+                    self._queue.put(connection_id)
+
+    def _schedule(self) -> None:
+        # 检查周期取刷新间隔的 1/4，限制在 5~60 秒之间
+        period = min(max(self._interval / 4, 5), 60)
+        while not self._stop.wait(period):
+            db = SessionLocal()
+            try:
+                metadata_store.init_db()
+                stale = [c.id for c in metadata_store.list_connections(db) if metadata_service.is_stale(c)]
+            except Exception:
+                stale = []
+            finally:
+                db.close()
+            for connection_id in stale:
+                if not self._busy_or_recently_failed(self.status(connection_id)):
+                    self.enqueue(connection_id)
+
+    def _busy_or_recently_failed(self, state: SyncState) -> bool:
+        if state.status in (QUEUED, RUNNING):
+            return True
+        # 失败的连接隔一个刷新间隔再重试，避免不可达的库被反复同步
+        return (
+            state.status == FAILED
+            and state.finished_at is not None
+            and (datetime.utcnow() - state.finished_at).total_seconds() < self._interval
+        )
+
+
+def _build_worker() -> MetadataSyncWorker:
+    settings = get_settings()
+    return MetadataSyncWorker(workers=settings.metadata_sync_workers, interval=settings.metadata_refresh_interval)
+
+
+sync_worker = _build_worker()
@@ -25,9 +25,21 @@ export interface TableInfo {
   columns: ColumnInfo[]
 }
 
+export interface SyncStatus {
+  connectionId: number
+  status: 'idle' | 'queued' | 'running' | 'succeeded' | 'failed'
+  queuedAt?: string
+  startedAt?: string
+  finishedAt?: string
+  error?: string
+  changes?: Record<string, number>
+}
+
 export interface MetadataResponse {
   connection: ConnectionOut
   tables: TableInfo[]
+  stale?: boolean
+  sync?: SyncStatus
 }
 
 export async function syncMetadataApi(payload: SyncPayload): Promise<MetadataResponse> {
@@ -50,3 +62,39 @@ export async function updateConnectionNameApi(connectionId: number, payload: { n
   return data as ConnectionOut
 }
 
+export async function getSyncStatusApi(connectionId: number): Promise<SyncStatus> {
+  const { data } = await apiClient.get(`/metadata/${connectionId}/sync`)
+  return data
+}
+
+export interface CatalogSearchHit {
+  kind: 'table' | 'column'
+  schema: string
+  table: string
+  isView: boolean
+  column?: string
+  dataType?: string
+  score: number
+}
+
+export interface CatalogSearchResponse {
+  query: string
+  total: number
+  truncated: boolean
+  limit: number
+  offset: number
+  items: CatalogSearchHit[]
+}
+
+export interface CatalogSearchParams {
+  q: string
+  kind?: 'all' | 'table' | 'column'
+  fuzzy?: boolean
+  limit?: number
+  offset?: number
+}
+
+export async function searchCatalogApi(connectionId: number, params: CatalogSearchParams): Promise<CatalogSearchResponse> {
+  const { data } = await apiClient.get(`/metadata/${connectionId}/search`, { params })
+  return data
+}